@@ -119,21 +119,27 @@ CHUNK METADATA:
 CHUNK CONTENT:
 {chunk_content}
 
-Provide the following in a structured format:
+The contextual_summary should situate this chunk within the broader lease document: what the section covers and its legal significance, starting with "This section..." or "This clause...". Example semantic_tags: rent_calculation, tenant_obligations, force_majeure, notice_requirements."""
 
-1. CONTEXTUAL_SUMMARY: A 1-2 sentence summary that situates this chunk within the broader lease document. Focus on what this section covers and its legal significance. Start with "This section..." or "This clause...".
+# Several chunks enriched in one request; each chunk is rendered with
+# ENRICHMENT_GROUP_CHUNK and the model returns a JSON array in chunk order
+ENRICHMENT_GROUP_PROMPT = """You are a legal document analyst. Analyze each of the following chunks from a commercial lease agreement and provide enrichment metadata for every chunk.
 
-2. SEMANTIC_TAGS: 3-5 relevant tags for retrieval (lowercase, underscore-separated). Examples: rent_calculation, tenant_obligations, force_majeure, notice_requirements
+DOCUMENT CONTEXT:
+Document Type: Commercial Lease Agreement
+Document Title: {doc_title}
 
-3. KEY_ENTITIES: List any specific entities mentioned (party names, addresses, dates, dollar amounts, percentages)
+{chunks}
 
-4. CLAUSE_TYPE: Classify into one of: {clause_types}
+Return a JSON array with exactly one object per chunk, in the same order as the chunks above. Each contextual_summary should situate its chunk within the broader lease document: what the section covers and its legal significance, starting with "This section..." or "This clause...". Example semantic_tags: rent_calculation, tenant_obligations, force_majeure, notice_requirements."""
 
-Format your response EXACTLY as:
-CONTEXTUAL_SUMMARY: [your summary]
-SEMANTIC_TAGS: [tag1, tag2, tag3]
-KEY_ENTITIES: [entity1, entity2]
-CLAUSE_TYPE: [clause_type]"""
+ENRICHMENT_GROUP_CHUNK = """[CHUNK {index}]
+CHUNK METADATA:
+{chunk_metadata}
+
+CHUNK CONTENT:
+{chunk_content}
+"""
 
 
 # --- Lease Extraction Prompts ---
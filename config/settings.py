@@ -31,6 +31,19 @@ VECTOR_NAMESPACE = "leases-test"  # Namespace where documents are indexed in Pin
 # --- Ingestion Configuration ---
 ENRICHMENT_BATCH_SIZE = 5
 ENRICHMENT_DELAY_SECONDS = 12.0  # ~5 batches/min to stay under 15 RPM
+ENRICHMENT_REQUESTS_PER_MINUTE = 15  # Gemini QPM budget for the LLM enricher
+ENRICHMENT_MAX_CONTENT_TOKENS = 500  # Chunk content budget per enrichment prompt
+ENRICHMENT_MAX_ATTEMPTS = 5  # Attempts per chunk on 429/5xx/timeouts before leaving it unenriched
+ENRICHMENT_REQUEST_TIMEOUT_SECONDS = 15.0  # Per-attempt deadline; a stalled call is abandoned and retried
+ENRICHMENT_CHUNKS_PER_REQUEST = 5  # Uncached chunks enriched together in one LLM call (1 = one call per chunk)
+ENRICHMENT_USE_BATCH_API = False  # Gemini Batch API: one job per document, but queued (minutes to hours)
+ENRICHMENT_BATCH_POLL_SECONDS = 10.0
+ENRICHMENT_CACHE_PATH = "data/enrichment_cache.json"  # Reused LLM enrichments (None = in-memory only)
+ENRICHMENT_CACHE_SIMILARITY = None  # e.g. 0.95 to reuse a near-duplicate clause (one embedding call per cache miss)
+ENRICHMENT_CACHE_MIN_JACCARD = 0.9  # Names/amounts that must also agree before a similarity hit is reused
+ENRICHMENT_WARM_CORPUS_PATH = "data/canonical_clauses.jsonl"  # Pre-enriched at startup when ENRICHER_WARM=1; reused verbatim, or reworded with ENRICHMENT_CACHE_SIMILARITY set
+EXTRACTION_MAX_CONCURRENCY = 4  # Extraction requests in flight for iter_extract / extract_clauses_many
+EXTRACTION_CACHE_DIR = None  # e.g. "data/extraction_cache" to reuse extractions of unchanged documents
 EMBEDDING_BATCH_SIZE = 50
 EMBEDDING_DELAY_SECONDS = 0.5
 
@@ -10,19 +10,20 @@ Exposes REST endpoints for:
 import os
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List
 import asyncio
+from concurrent.futures import ProcessPoolExecutor
 
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 from retrieval.orchestrator import LeaseRAGOrchestrator
 from analysis.portfolio import PortfolioAnalyzer
-from utils.db import get_all_leases, get_lease_by_tenant, DEFAULT_DB_PATH, get_leases_grouped_by_property, get_clauses_for_comparison
+from utils.db import get_all_leases, get_leases_summary, get_lease_by_tenant, DEFAULT_DB_PATH, get_leases_grouped_by_property, get_clauses_for_comparison
 
 # File Watcher Imports - use PollingObserver for network share compatibility
 from watchdog.observers.polling import PollingObserver
@@ -60,11 +61,18 @@ _orchestrator: Optional[LeaseRAGOrchestrator] = None
 _analyzer: Optional[PortfolioAnalyzer] = None
 _observer: Optional[PollingObserver] = None  # File watcher observer
 _ingestion_handler: Optional[IngestionHandler] = None  # Reference to handler
+_docgen_pool: Optional[ProcessPoolExecutor] = None  # Worker processes for .docx generation
+
+# Watchdog can fire several events for one file (create + modify + move);
+# notifications for the same file inside this window collapse into one broadcast.
+NOTIFY_DEBOUNCE_SECONDS = 0.5
 
 # WebSocket connection manager for real-time notifications
 class ConnectionManager:
     def __init__(self):
         self.active_connections: List[WebSocket] = []
+        self._pending_broadcasts: Dict[str, asyncio.TimerHandle] = {}
+        self._broadcast_tasks: set = set()
     
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
@@ -80,6 +88,28 @@ class ConnectionManager:
                 await connection.send_json(message)
             except Exception:
                 pass
+    
+    def schedule_broadcast(self, key: str, message: dict, delay: float = NOTIFY_DEBOUNCE_SECONDS):
+        """
+        Debounce a broadcast by key. Must be called from the event loop thread.
+        
+        Any broadcast still pending for the same key is cancelled and the
+        timer restarts, so a burst of events yields a single message.
+        """
+        loop = asyncio.get_running_loop()
+        
+        pending = self._pending_broadcasts.pop(key, None)
+        if pending:
+            pending.cancel()
+        
+        def _fire():
+            self._pending_broadcasts.pop(key, None)
+            task = loop.create_task(self.broadcast(message))
+            # Hold a reference until done so the task isn't garbage collected
+            self._broadcast_tasks.add(task)
+            task.add_done_callback(self._broadcast_tasks.discard)
+        
+        self._pending_broadcasts[key] = loop.call_later(delay, _fire)
 
 ws_manager = ConnectionManager()
 
@@ -99,12 +129,15 @@ async def startup_event():
         _observer.start()
         
         print(f"✅ File Watcher running (polling every {POLLING_INTERVAL}s)")
+        loop = asyncio.get_running_loop()
+        
         def notify_new_file(file_name: str, file_path: str):
-            asyncio.run(ws_manager.broadcast({
+            # Called from the observer thread - hand off to the server's event loop
+            loop.call_soon_threadsafe(ws_manager.schedule_broadcast, file_name, {
                 "type": "new_file",
                 "file_name": file_name,
                 "file_path": file_path,
-            }))
+            })
         IngestionHandler.register_callback(notify_new_file)
         
         print("✅ File Watcher running in background thread")
@@ -120,6 +153,11 @@ async def shutdown_event():
         _observer.stop()
         _observer.join()
         print("✅ File Watcher stopped")
+    
+    global _docgen_pool
+    if _docgen_pool:
+        _docgen_pool.shutdown(wait=False, cancel_futures=True)
+        _docgen_pool = None
 
 
 def get_orchestrator() -> LeaseRAGOrchestrator:
@@ -130,6 +168,19 @@ def get_orchestrator() -> LeaseRAGOrchestrator:
     return _orchestrator
 
 
+def get_docgen_pool() -> ProcessPoolExecutor:
+    """
+    Get or initialize the document generation process pool.
+    
+    python-docx rendering is CPU-bound and holds the GIL, so concurrent
+    requests are rendered in separate processes instead of threads.
+    """
+    global _docgen_pool
+    if _docgen_pool is None:
+        _docgen_pool = ProcessPoolExecutor(max_workers=min(4, os.cpu_count() or 1))
+    return _docgen_pool
+
+
 def get_analyzer() -> PortfolioAnalyzer:
     """Get or initialize the portfolio analyzer."""
     global _analyzer
@@ -213,7 +264,7 @@ async def get_portfolio_analytics():
 async def list_documents():
     """Get list of all lease documents."""
     try:
-        leases = get_all_leases()
+        leases = get_leases_summary()
         return {"documents": leases}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -561,11 +612,14 @@ async def generate_document(request: GenerateDocumentRequest):
         filename = f"Lease_{request.trade_name or request.tenant_name}_{uuid.uuid4().hex[:8]}.docx"
         filename = filename.replace(" ", "_").replace("/", "-")
         
-        # Generate the document
-        output_path = generate_lease_document(
+        # Generate the document in a worker process (keeps the event loop free)
+        loop = asyncio.get_running_loop()
+        output_path = await loop.run_in_executor(
+            get_docgen_pool(),
+            generate_lease_document,
             input_data,
-            output_filename=filename,
-            output_dir="output"
+            filename,
+            "output",
         )
         
         return FileResponse(
@@ -5,14 +5,27 @@ Replaces {{ tags }} in the template with corresponding values.
 All formatting (bold, highlighting) is handled within the template itself.
 """
 
+import io
 import re
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
 from pathlib import Path
 from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional
 from docx import Document
+from docx.oxml.ns import qn
+from docx.parts.hdrftr import FooterPart, HeaderPart
 from docx.table import Table
 
 
+# WordprocessingML names used when editing the template XML directly
+_W_P = qn("w:p")
+_W_TBL = qn("w:tbl")
+_RUN_TEXT_PATH = f"{qn('w:r')}/{qn('w:t')}"
+_XML_SPACE = qn("xml:space")
+
+
 # --- Data Models ---
 
 @dataclass
@@ -51,10 +64,21 @@ class LeaseGenerationInput:
     radius_restriction: str = ""
 
 
+@dataclass(frozen=True)
+class DateParts:
+    """Components of a parsed date (empty strings if the date wasn't recognized)."""
+    day: str = ""
+    day_ordinal: str = ""
+    month: str = ""
+    month_num: str = ""
+    year: str = ""
+    year_short: str = ""
+
+
 # --- Helper Functions ---
 
-def number_to_word(n: int) -> str:
-    """Convert an integer to its English word representation (0-200)."""
+def _compute_number_word(n: int) -> str:
+    """Spell out an integer in English words (0-200)."""
     ones = ["zero", "one", "two", "three", "four", "five", "six", "seven", 
             "eight", "nine", "ten", "eleven", "twelve", "thirteen", "fourteen",
             "fifteen", "sixteen", "seventeen", "eighteen", "nineteen"]
@@ -83,61 +107,85 @@ def number_to_word(n: int) -> str:
     return str(n)
 
 
-def parse_date(date_str: str) -> Dict[str, str]:
+# number_to_word only covers 0-200, so spell out the whole range once at import
+_NUMBER_WORDS = tuple(_compute_number_word(n) for n in range(201))
+
+
+def number_to_word(n: int) -> str:
+    """Convert an integer to its English word representation (0-200)."""
+    if 0 <= n <= 200:
+        return _NUMBER_WORDS[n]
+    return str(n)
+
+
+_MONTHS = {
+    "january": ("January", "01"), "february": ("February", "02"),
+    "march": ("March", "03"), "april": ("April", "04"),
+    "may": ("May", "05"), "june": ("June", "06"),
+    "july": ("July", "07"), "august": ("August", "08"),
+    "september": ("September", "09"), "october": ("October", "10"),
+    "november": ("November", "11"), "december": ("December", "12")
+}
+
+_ORDINALS = {1: "1st", 2: "2nd", 3: "3rd", 21: "21st", 22: "22nd", 23: "23rd", 31: "31st"}
+
+# First run of digits in a string (see extract_number)
+_NUMBER_RE = re.compile(r'\d+')
+
+# "Month Day, Year" or "Day Month Year"
+_DATE_RE = re.compile(
+    r'(?P<m1>\w+)\s+(?P<d1>\d{1,2}),?\s*(?P<y1>\d{4})'
+    r'|(?P<d2>\d{1,2})\s+(?P<m2>\w+)\s+(?P<y2>\d{4})'
+)
+
+
+@lru_cache(maxsize=256)
+def parse_date(date_str: str) -> DateParts:
     """Parse a date string into components."""
-    result = {
-        "day": "", "day_ordinal": "", "month": "", 
-        "month_num": "", "year": "", "year_short": ""
-    }
-    
     if not date_str:
-        return result
+        return DateParts()
     
-    months = {
-        "january": ("January", "01"), "february": ("February", "02"),
-        "march": ("March", "03"), "april": ("April", "04"),
-        "may": ("May", "05"), "june": ("June", "06"),
-        "july": ("July", "07"), "august": ("August", "08"),
-        "september": ("September", "09"), "october": ("October", "10"),
-        "november": ("November", "11"), "december": ("December", "12")
-    }
+    match = _DATE_RE.match(date_str)
+    if not match:
+        return DateParts()
     
-    ordinals = {1: "1st", 2: "2nd", 3: "3rd", 21: "21st", 22: "22nd", 23: "23rd", 31: "31st"}
+    if match.group("m1") is not None:
+        month_name, day, year = match.group("m1", "d1", "y1")
+    else:
+        month_name, day, year = match.group("m2", "d2", "y2")
     
-    # Try "Month Day, Year" format
-    match = re.match(r'(\w+)\s+(\d{1,2}),?\s*(\d{4})', date_str)
-    if match:
-        month_name, day, year = match.groups()
-        month_key = month_name.lower()
-        if month_key in months:
-            day_int = int(day)
-            result["day"] = day
-            result["day_ordinal"] = ordinals.get(day_int, f"{day}th")
-            result["month"], result["month_num"] = months[month_key]
-            result["year"] = year
-            result["year_short"] = year[-2:]
-            return result
+    month_key = month_name.lower()
+    if month_key not in _MONTHS:
+        return DateParts()
     
-    # Try "Day Month Year" format
-    match = re.match(r'(\d{1,2})\s+(\w+)\s+(\d{4})', date_str)
-    if match:
-        day, month_name, year = match.groups()
-        month_key = month_name.lower()
-        if month_key in months:
-            day_int = int(day)
-            result["day"] = day
-            result["day_ordinal"] = ordinals.get(day_int, f"{day}th")
-            result["month"], result["month_num"] = months[month_key]
-            result["year"] = year
-            result["year_short"] = year[-2:]
+    day_int = int(day)
+    if day_int in _ORDINALS:
+        day_ordinal = _ORDINALS[day_int]
+    else:
+        day_ordinal = day + "th"
     
-    return result
+    month, month_num = _MONTHS[month_key]
+    return DateParts(
+        day=day,
+        day_ordinal=day_ordinal,
+        month=month,
+        month_num=month_num,
+        year=year,
+        year_short=year[-2:],
+    )
+
+
+def _set_node_text(node, text: str):
+    """Set the text of a w:t node, keeping leading/trailing spaces visible in Word."""
+    node.text = text
+    if text[:1].isspace() or text[-1:].isspace():
+        node.set(_XML_SPACE, "preserve")
 
 
 def extract_number(text: str) -> Optional[int]:
     """Extract first integer from a string."""
-    match = re.search(r'(\d+)', str(text))
-    return int(match.group(1)) if match else None
+    match = _NUMBER_RE.search(str(text))
+    return int(match.group()) if match else None
 
 
 # --- Document Generator ---
@@ -147,26 +195,34 @@ class DocumentGenerator:
     
     DEFAULT_TEMPLATE_PATH = Path("data/raw_pdfs/Lease Precedent 11939 240 Street MR Jun 19, 2020 -- with tags.docx")
     
+    # Header row keywords identifying the rent schedule table (2+ must match)
+    RENT_SCHEDULE_KEYWORDS = ("lease year", "per square foot", "per annum", "per month")
+    
     def __init__(self, template_path: Path = None):
         self.template_path = template_path or self.DEFAULT_TEMPLATE_PATH
         if not self.template_path.exists():
             raise FileNotFoundError(f"Template not found: {self.template_path}")
+        # Read the template once; each generate() parses a fresh copy from memory
+        self._template_bytes = self.template_path.read_bytes()
     
     def generate(self, input_data: LeaseGenerationInput, output_path: Path) -> Path:
         """Generate a populated lease document."""
         print(f"[DEBUG] Using template: {self.template_path}")
-        doc = Document(str(self.template_path))
+        doc = Document(io.BytesIO(self._template_bytes))
         
         # Build tag -> value mapping
         tags = self._build_tag_mapping(input_data)
         print(f"[DEBUG] Generated {len(tags)} tags")
         print(f"[DEBUG] Sample tags: tenant_name='{tags.get('{{ tenant_name }}', 'N/A')}'")
         
+        # Classify tables once; both passes below need the rent schedule tables
+        rent_tables = [table for table in doc.tables if self._is_rent_schedule_table(table)]
+        
         # Replace in all paragraphs (body, headers, footers)
-        self._replace_tags_in_document(doc, tags)
+        self._replace_tags_in_document(doc, tags, rent_tables)
         
         # Handle rent schedule table separately (dynamic rows)
-        self._populate_rent_schedule(doc, input_data.rent_schedule)
+        self._populate_rent_schedule(rent_tables, input_data.rent_schedule)
         
         # Save
         output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -201,18 +257,18 @@ class DocumentGenerator:
         # Parsed dates (lease date)
         lease_parts = parse_date(data.lease_date)
         tags["{{ lease_full }}"] = data.lease_date
-        tags["{{ lease_day_ordinal }}"] = lease_parts["day_ordinal"]
-        tags["{{ lease_month }}"] = lease_parts["month"]
-        tags["{{ lease_year_full }}"] = lease_parts["year"]
-        tags["{{ lease_year_short }}"] = lease_parts["year_short"]
+        tags["{{ lease_day_ordinal }}"] = lease_parts.day_ordinal
+        tags["{{ lease_month }}"] = lease_parts.month
+        tags["{{ lease_year_full }}"] = lease_parts.year
+        tags["{{ lease_year_short }}"] = lease_parts.year_short
         
         # Parsed dates (indemnity date)
         indem_parts = parse_date(data.indemnity_date)
         tags["{{ indemnity_full }}"] = data.indemnity_date
-        tags["{{ indemnity_day_ordinal }}"] = indem_parts["day_ordinal"]
-        tags["{{ indemnity_month }}"] = indem_parts["month"]
-        tags["{{ indemnity_year_full }}"] = indem_parts["year"]
-        tags["{{ indemnity_year_short }}"] = indem_parts["year_short"]
+        tags["{{ indemnity_day_ordinal }}"] = indem_parts.day_ordinal
+        tags["{{ indemnity_month }}"] = indem_parts.month
+        tags["{{ indemnity_year_full }}"] = indem_parts.year
+        tags["{{ indemnity_year_short }}"] = indem_parts.year_short
         
         # Term (word + number pairs)
         term_num = extract_number(data.initial_term)
@@ -242,126 +298,182 @@ class DocumentGenerator:
         
         return tags
     
-    def _replace_tags_in_document(self, doc: Document, tags: Dict[str, str]):
-        """Replace all {{ tags }} throughout the document."""
-        # Body paragraphs
-        for para in doc.paragraphs:
-            self._replace_tags_in_paragraph(para, tags)
-        
-        # Tables (non-rent-schedule cells)
-        for table in doc.tables:
-            if not self._is_rent_schedule_table(table):
-                for row in table.rows:
-                    for cell in row.cells:
-                        for para in cell.paragraphs:
-                            self._replace_tags_in_paragraph(para, tags)
-        
-        # Headers and footers
-        for section in doc.sections:
-            for header in [section.header, section.first_page_header, section.even_page_header]:
-                if header:
-                    for para in header.paragraphs:
-                        self._replace_tags_in_paragraph(para, tags)
-            for footer in [section.footer, section.first_page_footer, section.even_page_footer]:
-                if footer:
-                    for para in footer.paragraphs:
-                        self._replace_tags_in_paragraph(para, tags)
+    def _iter_all_paragraphs(self, doc: Document, rent_tables: List[Table]):
+        """
+        Yield every w:p element in the body, headers and footers.
+        
+        Works on the raw XML so no python-docx Paragraph/Run wrappers are
+        built. Rent schedule tables are skipped (they are filled separately).
+        """
+        # Keyed on the w:tbl elements themselves: Table wrappers are rebuilt on
+        # every doc.tables access, so their id() isn't stable
+        skip_tables = {table._tbl for table in rent_tables}
+        
+        def walk(element):
+            for child in element:
+                if child.tag == _W_P:
+                    yield child
+                elif child.tag == _W_TBL and child in skip_tables:
+                    continue
+                else:
+                    yield from walk(child)
+        
+        # Body (including tables)
+        yield from walk(doc.element.body)
+        
+        # Headers and footers of every section
+        for part in doc.part.package.iter_parts():
+            if isinstance(part, (HeaderPart, FooterPart)):
+                yield from walk(part.element)
     
-    def _replace_tags_in_paragraph(self, para, tags: Dict[str, str]):
-        """Replace tags in a single paragraph, preserving run formatting."""
-        if "{{" not in para.text:
+    def _replace_tags_in_document(self, doc: Document, tags: Dict[str, str], rent_tables: List[Table]):
+        """Replace all {{ tags }} throughout the document (except the rent schedule tables)."""
+        # Tags without a value are left in place, so drop them up front
+        tags = {tag: value for tag, value in tags.items() if value}
+        if not tags:
             return
         
-        for tag, value in tags.items():
-            if not value or tag not in para.text:
-                continue
+        # One regex matching exactly the tags that have values in this document
+        tag_re = re.compile("|".join(map(re.escape, tags)))
+        
+        for p in self._iter_all_paragraphs(doc, rent_tables):
+            self._replace_tags_in_paragraph(p, tags, tag_re)
+    
+    def _replace_tags_in_paragraph(self, p, tags: Dict[str, str], tag_re: re.Pattern):
+        """
+        Replace tags in a single paragraph, preserving run formatting.
+        
+        Only the text of the paragraph's w:t nodes is rewritten; run
+        properties and other run content are left untouched.
+        
+        Args:
+            p: Paragraph (w:p) element to update in place.
+            tags: Mapping of {{ tag }} -> replacement value.
+            tag_re: Regex matching exactly the tags in `tags`.
+        """
+        nodes = p.findall(_RUN_TEXT_PATH)
+        if not nodes:
+            return
+        
+        def tag_value(match) -> str:
+            return tags.get(match.group()) or match.group()
+        
+        # Fast path: a single text node can be substituted in one regex pass
+        if len(nodes) == 1:
+            text, count = tag_re.subn(tag_value, nodes[0].text or "")
+            if count:
+                _set_node_text(nodes[0], text)
+            return
+        
+        node_texts = [node.text or "" for node in nodes]
+        full_text = "".join(node_texts)
+        
+        # Single scan for tags across the joined text, instead of
+        # searching the text once per tag
+        hits = []
+        for match in tag_re.finditer(full_text):
+            value = tags.get(match.group())
+            if value:
+                hits.append((match.start(), match.end(), value))
+        
+        if not hits:
+            return
+        
+        # End offset of each text node in the original paragraph text
+        node_ends = list(accumulate(len(text) for text in node_texts))
+        
+        # Patch from the last hit backwards so earlier offsets stay valid
+        for tag_start, tag_end, value in reversed(hits):
+            # First node ending after tag_start is the one containing it
+            i = bisect_right(node_ends, tag_start)
+            node_start = node_ends[i - 1] if i else 0
+            text = node_texts[i]
             
-            # Try to replace within individual runs first (preserves formatting perfectly)
-            replaced = False
-            for run in para.runs:
-                if tag in run.text:
-                    run.text = run.text.replace(tag, value)
-                    replaced = True
+            if tag_end <= node_ends[i]:
+                # Tag sits inside one node (preserves formatting perfectly)
+                node_texts[i] = text[:tag_start - node_start] + value + text[tag_end - node_start:]
+                _set_node_text(nodes[i], node_texts[i])
+                continue
             
-            # If tag spans multiple runs, we need to find and reconstruct
-            if not replaced and tag in para.text:
-                # Build a map of character positions to runs
-                runs_text = [(run, run.text) for run in para.runs]
-                full_text = "".join(t for _, t in runs_text)
-                tag_start = full_text.find(tag)
-                
-                if tag_start >= 0:
-                    tag_end = tag_start + len(tag)
-                    # Find which runs contain the tag
-                    pos = 0
-                    for run, text in runs_text:
-                        run_start = pos
-                        run_end = pos + len(text)
-                        
-                        # If this run contains start of tag
-                        if run_start <= tag_start < run_end:
-                            # Replace from tag_start to end of this run with value + remaining
-                            before = text[:tag_start - run_start]
-                            after_in_run = text[min(tag_end - run_start, len(text)):]
-                            run.text = before + value + after_in_run
-                            # Clear subsequent runs that were part of the tag
-                            clear_remaining = tag_end - run_end
-                            if clear_remaining > 0:
-                                for next_run, next_text in runs_text[runs_text.index((run, text)) + 1:]:
-                                    if clear_remaining >= len(next_text):
-                                        next_run.text = ""
-                                        clear_remaining -= len(next_text)
-                                    else:
-                                        next_run.text = next_text[clear_remaining:]
-                                        break
-                            break
-                        pos = run_end
+            # Tag spans multiple runs: value goes into the first node, the
+            # rest of the tag is cut from the nodes that follow
+            node_texts[i] = text[:tag_start - node_start] + value
+            _set_node_text(nodes[i], node_texts[i])
+            for j in range(i + 1, len(nodes)):
+                next_start = node_ends[j - 1]
+                if next_start >= tag_end:
+                    break
+                if node_ends[j] == next_start:
+                    continue
+                node_texts[j] = node_texts[j][min(tag_end, node_ends[j]) - next_start:]
+                _set_node_text(nodes[j], node_texts[j])
     
     def _is_rent_schedule_table(self, table: Table) -> bool:
         """Check if table is the rent schedule based on header keywords."""
         if not table.rows:
             return False
         first_row_text = " ".join(cell.text.lower() for cell in table.rows[0].cells)
-        keywords = ["lease year", "per square foot", "per annum", "per month"]
-        return sum(1 for kw in keywords if kw in first_row_text) >= 2
+        # Two keyword hits are enough - stop as soon as the second one is found
+        hits = 0
+        for keyword in self.RENT_SCHEDULE_KEYWORDS:
+            if keyword in first_row_text:
+                hits += 1
+                if hits == 2:
+                    return True
+        return False
     
-    def _populate_rent_schedule(self, doc: Document, rent_schedule: List[RentRow]):
-        """Populate the rent schedule table with data rows."""
-        if not rent_schedule:
+    def _populate_rent_schedule(self, rent_tables: List[Table], rent_schedule: List[RentRow]):
+        """Populate the (first) rent schedule table with data rows."""
+        if not rent_schedule or not rent_tables:
             return
+        table = rent_tables[0]
         
-        for table in doc.tables:
-            if not self._is_rent_schedule_table(table):
-                continue
+        # Format each currency column in one pass before touching the table
+        format_rate = "${:.2f}".format
+        format_amount = "${:,.2f}".format
+        sqft_texts = list(map(format_rate, [r.per_sqft for r in rent_schedule]))
+        annum_texts = list(map(format_amount, [r.per_annum for r in rent_schedule]))
+        month_texts = list(map(format_amount, [r.per_month for r in rent_schedule]))
+        
+        # table.rows rebuilds the whole row list on every access, so
+        # take it once and track added rows alongside it
+        rows = list(table.rows)
+        
+        # Skip header row (index 0), populate data rows
+        columns = zip(rent_schedule, sqft_texts, annum_texts, month_texts)
+        for row_idx, (rent_row, sqft_text, annum_text, month_text) in enumerate(columns, start=1):
+            # Add row if needed
+            if row_idx >= len(rows):
+                rows.append(table.add_row())
             
-            # Skip header row (index 0), populate data rows
-            for i, rent_row in enumerate(rent_schedule):
-                row_idx = 1 + i
-                
-                # Add row if needed
-                if row_idx >= len(table.rows):
-                    table.add_row()
-                
-                row = table.rows[row_idx]
-                if len(row.cells) >= 4:
-                    year_range = f"{rent_row.lease_year_start}-{rent_row.lease_year_end}" \
-                        if rent_row.lease_year_start != rent_row.lease_year_end \
-                        else str(rent_row.lease_year_start)
-                    row.cells[0].text = year_range
-                    row.cells[1].text = f"${rent_row.per_sqft:.2f}"
-                    row.cells[2].text = f"${rent_row.per_annum:,.2f}"
-                    row.cells[3].text = f"${rent_row.per_month:,.2f}"
-            break
+            # row.cells is also rebuilt on every access
+            cells = rows[row_idx].cells
+            if len(cells) >= 4:
+                year_range = f"{rent_row.lease_year_start}-{rent_row.lease_year_end}" \
+                    if rent_row.lease_year_start != rent_row.lease_year_end \
+                    else str(rent_row.lease_year_start)
+                cells[0].text = year_range
+                cells[1].text = sqft_text
+                cells[2].text = annum_text
+                cells[3].text = month_text
 
 
 # --- Factory Function ---
 
-def generate_lease_document(
-    input_data: Dict[str, Any],
-    output_filename: str = "generated_lease.docx",
-    output_dir: str = "output"
-) -> Path:
-    """Generate a lease document from a dictionary of input data."""
+# Shared generator for the default template (lazy initialized)
+_default_generator: Optional[DocumentGenerator] = None
+
+
+def get_default_generator() -> DocumentGenerator:
+    """Get or initialize the generator for the default template."""
+    global _default_generator
+    if _default_generator is None:
+        _default_generator = DocumentGenerator()
+    return _default_generator
+
+
+def _build_generation_input(input_data: Dict[str, Any]) -> LeaseGenerationInput:
+    """Convert a dictionary of input data (API payload) into a LeaseGenerationInput."""
     rent_rows = [
         RentRow(
             lease_year_start=row.get("lease_year_start", 1),
@@ -373,7 +485,7 @@ def generate_lease_document(
         for row in input_data.get("rent_schedule", [])
     ]
     
-    lease_input = LeaseGenerationInput(
+    return LeaseGenerationInput(
         tenant_name=input_data.get("tenant_name", ""),
         tenant_address=input_data.get("tenant_address", ""),
         indemnifier_name=input_data.get("indemnifier_name", ""),
@@ -396,10 +508,17 @@ def generate_lease_document(
         exclusive_use=input_data.get("exclusive_use", ""),
         radius_restriction=input_data.get("radius_restriction", ""),
     )
-    
-    generator = DocumentGenerator()
+
+
+def generate_lease_document(
+    input_data: Dict[str, Any],
+    output_filename: str = "generated_lease.docx",
+    output_dir: str = "output"
+) -> Path:
+    """Generate a lease document from a dictionary of input data."""
+    generator = get_default_generator()
     output_path = Path(output_dir) / output_filename
-    return generator.generate(lease_input, output_path)
+    return generator.generate(_build_generation_input(input_data), output_path)
 
 
 # --- Test Block ---
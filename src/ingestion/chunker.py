@@ -12,13 +12,13 @@ This module is responsible for:
 import os
 import sys
 import re
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 from dataclasses import dataclass, field
 
 # Add project root to path for config imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
 
-from langchain_text_splitters import MarkdownHeaderTextSplitter, RecursiveCharacterTextSplitter
+from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from config.settings import MAX_CHUNK_TOKENS, SECONDARY_CHUNK_SIZE, SECONDARY_CHUNK_OVERLAP, ORPHAN_CHUNK_MIN_TOKENS
 
@@ -35,18 +35,21 @@ class DocumentChunker:
     """
     Context-aware document chunker for legal documents.
     
-    Uses MarkdownHeaderTextSplitter for primary header-based splitting,
-    then applies RecursiveCharacterTextSplitter for oversized chunks.
+    Splits on markdown headers in a single pass over the lines (same output as
+    langchain's MarkdownHeaderTextSplitter with strip_headers=False), then
+    applies RecursiveCharacterTextSplitter for oversized chunks.
     """
     
     # Patterns to clean from text (boilerplate, page markers, etc.)
+    # Each pattern describes a whole line with surrounding whitespace stripped;
+    # [^\S\n] is used instead of \s so a match never runs onto the next line.
     BOILERPLATE_PATTERNS = [
-        r'^INITIAL\s*$',                          # "INITIAL" alone on a line
-        r'^Landlord\s+Tenant\s*$',                # "Landlord  Tenant" footer
-        r'^MR\s*[–-]\s*July\s+2020\s*$',          # Date footer
-        r'^\d{1,3}\s*$',                          # Standalone page numbers
-        r'^#+\s*\d{1,3}\s*$',                     # Headers that are just numbers
-        r'^\s*$',                                 # Empty lines (will be normalized)
+        r'INITIAL',                                     # "INITIAL" alone on a line
+        r'Landlord[^\S\n]+Tenant',                      # "Landlord  Tenant" footer
+        r'MR[^\S\n]*[–-][^\S\n]*July[^\S\n]+2020',      # Date footer
+        r'\d{1,3}',                                     # Standalone page numbers
+        r'#+[^\S\n]*\d{1,3}',                           # Headers that are just numbers
+        r'',                                            # Empty lines (will be normalized)
     ]
     
     # Regex to detect Table of Contents entries (header followed by just a page number)
@@ -55,13 +58,34 @@ class DocumentChunker:
         re.MULTILINE
     )
     
-    # Pattern to match the entire Table of Contents section
-    # Matches from "# TABLE OF CONTENTS" until the first content section (ARTICLE with substantive text)
-    TOC_SECTION_PATTERN = re.compile(
-        r'#\s*TABLE\s+OF\s*\n?\s*CONTENTS.*?(?=\n#\s*ARTICLE\s+1\s+INTERPRETATION\n+1\.01)',
-        re.DOTALL | re.IGNORECASE
+    # Start and end of the Table of Contents section: from "# TABLE OF CONTENTS"
+    # until the first content section (ARTICLE with substantive text)
+    TOC_START_RE = re.compile(r'#\s*TABLE\s+OF\s*\n?\s*CONTENTS', re.IGNORECASE)
+    TOC_END_RE = re.compile(r'\n#\s*ARTICLE\s+1\s+INTERPRETATION\n+1\.01', re.IGNORECASE)
+    
+    # TOC entries and boilerplate lines as one regex, so noise is removed in a
+    # single pass over the text. TOC entries are tried first at each line start
+    # (they used to be stripped before the boilerplate pass); every alternative
+    # also consumes its trailing newline so no blank line is left behind.
+    LINE_NOISE_RE = re.compile(
+        r'(?:' + TOC_PATTERN.pattern + r')(?:\n|\Z)'
+        r'|^[^\S\n]*(?:' + '|'.join(f'(?:{p})' for p in BOILERPLATE_PATTERNS) + r')[^\S\n]*(?:\n|\Z)',
+        re.MULTILINE | re.IGNORECASE
     )
     
+    # Runs of more than 2 consecutive newlines (collapsed by _clean_text)
+    BLANK_LINES_RE = re.compile(r'\n{3,}')
+    
+    # Phrases that mark a chunk as containing a definition (compared lowercase)
+    DEFINITION_MARKERS = tuple(marker.lower() for marker in [
+        '" means', "' means", '" means', "' means",  # Various quote styles
+        'means:', 'shall mean', 'is defined as',
+        '"Common', '"Landlord', '"Tenant', '"Premises',  # Common legal terms
+    ])
+    
+    # Markdown formatting characters mapped to spaces for word counting
+    MARKDOWN_TO_SPACE = str.maketrans('#*_-|', '     ')
+    
     # Headers to split on (in order of hierarchy)
     HEADERS_TO_SPLIT_ON = [
         ("#", "article"),
@@ -86,12 +110,6 @@ class DocumentChunker:
         self.secondary_chunk_size = secondary_chunk_size
         self.secondary_chunk_overlap = secondary_chunk_overlap
         
-        # Primary splitter: header-based
-        self.header_splitter = MarkdownHeaderTextSplitter(
-            headers_to_split_on=self.HEADERS_TO_SPLIT_ON,
-            strip_headers=False,  # Keep headers in content for context
-        )
-        
         # Secondary splitter: for oversized chunks
         self.recursive_splitter = RecursiveCharacterTextSplitter(
             chunk_size=self.secondary_chunk_size,
@@ -99,6 +117,35 @@ class DocumentChunker:
             separators=["\n\n", "\n", ". ", " ", ""],
         )
     
+    @classmethod
+    def remove_toc_sections(cls, text: str) -> str:
+        """
+        Remove every Table of Contents section.
+        
+        A section runs from a TOC_START_RE heading up to (not including) the
+        next TOC_END_RE marker; a heading with no marker after it is kept.
+        A single lazy DOTALL regex would rescan to the end of the text from
+        each such heading, which is quadratic in the worst case. Searching
+        for the end marker only after a heading is found, and stopping once
+        none is left, keeps the scan linear.
+        
+        Args:
+            text: Raw document text.
+            
+        Returns:
+            Text with the TOC sections removed.
+        """
+        parts = []
+        pos = 0
+        while (start := cls.TOC_START_RE.search(text, pos)) is not None:
+            end = cls.TOC_END_RE.search(text, start.end())
+            if end is None:
+                break  # No end marker left, so no later heading can match either
+            parts.append(text[pos:start.start()])
+            pos = end.start()
+        parts.append(text[pos:])
+        return "".join(parts)
+    
     def _clean_text(self, text: str) -> str:
         """
         Clean boilerplate and noise from the document text.
@@ -109,33 +156,100 @@ class DocumentChunker:
         Returns:
             Cleaned text with boilerplate removed.
         """
-        # Step 0a: Remove entire Table of Contents section if present
-        text = self.TOC_SECTION_PATTERN.sub('', text)
+        # Remove entire Table of Contents section if present
+        text = self.remove_toc_sections(text)
+        
+        # Drop any remaining TOC entries (headers followed by just page numbers,
+        # e.g. "# 7.02 Light Fixtures...\n22") and boilerplate lines in one scan
+        cleaned = self.LINE_NOISE_RE.sub('', text)
+        # Remove excessive blank lines (more than 2 consecutive)
+        cleaned = self.BLANK_LINES_RE.sub('\n\n', cleaned)
         
-        # Step 0b: Remove any remaining TOC entries (headers followed by just page numbers)
-        # This catches patterns like "# 7.02 Light Fixtures...\n22" from TOC
-        text = self.TOC_PATTERN.sub('', text)
+        return cleaned.strip()
+    
+    def _split_by_headers(self, text: str) -> List[Tuple[Dict[str, str], str]]:
+        """
+        Split markdown text into sections on the headers in HEADERS_TO_SPLIT_ON.
         
-        lines = text.split('\n')
-        cleaned_lines = []
+        Header lines are kept in the content. Consecutive blocks under the same
+        headers are joined with "  \n", and a header-only block is folded into
+        the sub-section that follows it (as MarkdownHeaderTextSplitter does).
         
-        for line in lines:
-            # Check if line matches any boilerplate pattern
-            is_boilerplate = False
-            for pattern in self.BOILERPLATE_PATTERNS:
-                if re.match(pattern, line.strip(), re.IGNORECASE):
-                    is_boilerplate = True
-                    break
+        Args:
+            text: Cleaned markdown text.
             
-            if not is_boilerplate:
-                cleaned_lines.append(line)
+        Returns:
+            List of (metadata, content) tuples in document order.
+        """
+        # Longest separator first so "##" isn't mistaken for "#"
+        separators = sorted(self.HEADERS_TO_SPLIT_ON, key=lambda h: len(h[0]), reverse=True)
         
-        # Join and normalize whitespace
-        cleaned = '\n'.join(cleaned_lines)
-        # Remove excessive blank lines (more than 2 consecutive)
-        cleaned = re.sub(r'\n{3,}', '\n\n', cleaned)
+        # Each section: [content_parts, metadata, last_line_is_header]
+        sections = []
         
-        return cleaned.strip()
+        def flush(lines: List[str], metadata: Dict[str, str]):
+            content = "\n".join(lines)
+            if sections and (
+                sections[-1][1] == metadata
+                or (len(sections[-1][1]) < len(metadata) and sections[-1][2])
+            ):
+                # Same headers, or the previous section is just its parent header
+                sections[-1][0].append(content)
+                sections[-1][1] = metadata
+            else:
+                sections.append([[content], metadata, False])
+            sections[-1][2] = lines[-1].startswith("#")
+        
+        current_lines: List[str] = []
+        current_metadata: Dict[str, str] = {}
+        header_stack: List[Tuple[int, str]] = []
+        in_code_block = False
+        opening_fence = ""
+        
+        for line in text.split("\n"):
+            stripped = line.strip()
+            if not stripped.isprintable():
+                stripped = "".join(filter(str.isprintable, stripped))
+            
+            # Lines inside fenced code blocks are never headers or separators
+            if not in_code_block:
+                if stripped.startswith("```") and stripped.count("```") == 1:
+                    in_code_block, opening_fence = True, "```"
+                elif stripped.startswith("~~~"):
+                    in_code_block, opening_fence = True, "~~~"
+            elif stripped.startswith(opening_fence):
+                in_code_block, opening_fence = False, ""
+            
+            if in_code_block:
+                current_lines.append(stripped)
+                continue
+            
+            for sep, name in separators:
+                if stripped.startswith(sep) and (len(stripped) == len(sep) or stripped[len(sep)] == " "):
+                    # New header closes any open header of the same or deeper level
+                    level = len(sep)
+                    metadata = dict(current_metadata)
+                    while header_stack and header_stack[-1][0] >= level:
+                        metadata.pop(header_stack.pop()[1], None)
+                    header_stack.append((level, name))
+                    metadata[name] = stripped[len(sep):].strip()
+                    
+                    if current_lines:
+                        flush(current_lines, current_metadata)
+                    current_lines = [stripped]
+                    current_metadata = metadata
+                    break
+            else:
+                if stripped:
+                    current_lines.append(stripped)
+                elif current_lines:
+                    flush(current_lines, current_metadata)
+                    current_lines = []
+        
+        if current_lines:
+            flush(current_lines, current_metadata)
+        
+        return [(dict(metadata), "  \n".join(parts)) for parts, metadata, _ in sections]
     
     def _count_tokens(self, text: str) -> int:
         """
@@ -147,7 +261,7 @@ class DocumentChunker:
         Returns:
             Approximate token count.
         """
-        return len(text) // 4
+        return len(text) >> 2
     
     def _is_orphan_chunk(self, text: str, min_words: int = 5) -> bool:
         """
@@ -161,42 +275,63 @@ class DocumentChunker:
             True if the chunk is an orphan and should be discarded.
         """
         # NEVER discard chunks containing definitions - these are critical
-        definition_markers = [
-            '" means', "' means", '" means', "' means",  # Various quote styles
-            'means:', 'shall mean', 'is defined as',
-            '"Common', '"Landlord', '"Tenant', '"Premises',  # Common legal terms
-        ]
-        for marker in definition_markers:
-            if marker.lower() in text.lower():
+        lowered = text.lower()
+        for marker in self.DEFINITION_MARKERS:
+            if marker in lowered:
                 return False  # Preserve this chunk - it has a definition
         
         # Remove markdown formatting for word count
-        clean = re.sub(r'[#*_\-|]', ' ', text)
-        words = clean.split()
-        return len(words) < min_words
+        return len(text.translate(self.MARKDOWN_TO_SPACE).split()) < min_words
     
-    def chunk(self, text: str) -> List[Chunk]:
+    def iter_chunks(self, text: str) -> Iterator[Chunk]:
         """
-        Split document into coherent, semantic chunks.
+        Split document into coherent, semantic chunks, yielding each once final.
+        
+        A chunk is yielded as soon as the next non-orphan chunk starts, so
+        downstream stages (e.g. enrichment) can begin before the whole
+        document has been chunked. Every chunk except the last has at least
+        ORPHAN_CHUNK_MIN_TOKENS tokens.
         
         Args:
             text: Raw document text (markdown format).
             
-        Returns:
-            List of Chunk objects with content and metadata.
+        Yields:
+            Chunk objects with content and metadata.
         """
         # Step 1: Clean the text
         cleaned_text = self._clean_text(text)
         
         # Step 2: Split by headers
-        header_docs = self.header_splitter.split_text(cleaned_text)
+        sections = self._split_by_headers(cleaned_text)
         
-        preliminary_chunks = []
+        # Step 4: Merge orphan chunks with the next chunk. While the pending
+        # chunk is still an orphan (header-only, < threshold tokens), fold
+        # the next chunk into it; otherwise it is final.
+        pending = None
+        
+        for chunk in self._iter_section_chunks(sections):
+            if pending is None:
+                pending = chunk
+            elif pending.token_count < ORPHAN_CHUNK_MIN_TOKENS:
+                merged_content = f"{pending.content}\n\n{chunk.content}"
+                
+                # Combine metadata (prefer next chunk's metadata, add orphan's if different)
+                pending = Chunk(
+                    content=merged_content.strip(),
+                    metadata={**pending.metadata, **chunk.metadata},
+                    token_count=len(merged_content) >> 2,
+                )
+            else:
+                yield pending
+                pending = chunk
         
-        for doc in header_docs:
-            content = doc.page_content
-            metadata = doc.metadata
-            token_count = self._count_tokens(content)
+        if pending is not None:
+            yield pending
+    
+    def _iter_section_chunks(self, sections: List[Tuple[Dict[str, str], str]]) -> Iterator[Chunk]:
+        """Yield preliminary chunks for each header section, splitting oversized ones."""
+        for metadata, content in sections:
+            token_count = len(content) >> 2  # Same estimate as _count_tokens
             
             # Step 3: Secondary split if chunk is too large
             if token_count > self.max_tokens:
@@ -207,62 +342,30 @@ class DocumentChunker:
                         continue
                     
                     sub_metadata = {**metadata, "sub_chunk": i + 1}
-                    preliminary_chunks.append(Chunk(
+                    yield Chunk(
                         content=sub_content.strip(),
                         metadata=sub_metadata,
-                        token_count=self._count_tokens(sub_content),
-                    ))
+                        token_count=len(sub_content) >> 2,
+                    )
             else:
-                # Don't skip orphans yet - we'll merge them in post-processing
-                preliminary_chunks.append(Chunk(
+                # Don't skip orphans yet - they are merged in iter_chunks
+                yield Chunk(
                     content=content.strip(),
                     metadata=metadata,
                     token_count=token_count,
-                ))
-        
-        # Step 4: Post-process to merge orphan chunks with next chunk (iterative)
-        # Keep merging until no more orphans can be resolved
-        chunks_to_process = preliminary_chunks
-        max_iterations = 10  # Prevent infinite loops
+                )
+    
+    def chunk(self, text: str) -> List[Chunk]:
+        """
+        Split document into coherent, semantic chunks.
         
-        for _ in range(max_iterations):
-            merged_chunks = []
-            i = 0
-            any_merges = False
-            
-            while i < len(chunks_to_process):
-                current_chunk = chunks_to_process[i]
-                
-                # Check if current chunk is an orphan (header-only, < threshold tokens)
-                if current_chunk.token_count < ORPHAN_CHUNK_MIN_TOKENS and i + 1 < len(chunks_to_process):
-                    # Merge with next chunk
-                    next_chunk = chunks_to_process[i + 1]
-                    merged_content = f"{current_chunk.content}\n\n{next_chunk.content}"
-                    
-                    # Combine metadata (prefer next chunk's metadata, add orphan's if different)
-                    merged_metadata = {**current_chunk.metadata, **next_chunk.metadata}
-                    
-                    merged_chunks.append(Chunk(
-                        content=merged_content.strip(),
-                        metadata=merged_metadata,
-                        token_count=self._count_tokens(merged_content),
-                    ))
-                    i += 2  # Skip next chunk since we merged it
-                    any_merges = True
-                else:
-                    # Keep chunk as-is if it's not an orphan or it's the last chunk
-                    merged_chunks.append(current_chunk)
-                    i += 1
-            
-            chunks_to_process = merged_chunks
+        Args:
+            text: Raw document text (markdown format).
             
-            # If no merges happened this iteration, we're done
-            if not any_merges:
-                break
-        
-        final_chunks = chunks_to_process
-        
-        return final_chunks
+        Returns:
+            List of Chunk objects with content and metadata.
+        """
+        return list(self.iter_chunks(text))
 
 
 # --- Test Block ---
@@ -11,27 +11,125 @@ This module is responsible for:
 
 import os
 import sys
+import re
+import json
+import time
 import asyncio
-from typing import List, Optional
-from dataclasses import dataclass, field
+import hashlib
+import tempfile
+import functools
+import itertools
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Literal, Optional, Tuple
+from dataclasses import dataclass, field, replace
+import numpy as np
+import orjson
+import httpx
 from dotenv import load_dotenv
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+from tqdm.asyncio import tqdm as atqdm
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
 
 # Add project root to path for config imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
 
 # New google.genai SDK (replaces deprecated google.generativeai)
 from google import genai
+from google.genai import errors as genai_errors
+from google.genai import types
 
-from config.settings import DEFAULT_LLM_MODEL, CLAUSE_TYPES
-from config.prompts import ENRICHMENT_PROMPT
+from config.settings import (
+    DEFAULT_LLM_MODEL,
+    DEFAULT_EMBEDDING_MODEL,
+    CLAUSE_TYPES,
+    ENRICHMENT_REQUESTS_PER_MINUTE,
+    ENRICHMENT_MAX_ATTEMPTS,
+    ENRICHMENT_REQUEST_TIMEOUT_SECONDS,
+    ENRICHMENT_CHUNKS_PER_REQUEST,
+    ENRICHMENT_MAX_CONTENT_TOKENS,
+    ENRICHMENT_USE_BATCH_API,
+    ENRICHMENT_BATCH_POLL_SECONDS,
+    ENRICHMENT_CACHE_PATH,
+    ENRICHMENT_CACHE_SIMILARITY,
+    ENRICHMENT_CACHE_MIN_JACCARD,
+    ENRICHMENT_WARM_CORPUS_PATH,
+)
+from config.prompts import ENRICHMENT_PROMPT, ENRICHMENT_GROUP_PROMPT, ENRICHMENT_GROUP_CHUNK
 
-# Load environment variables
-load_dotenv()
 
+@functools.lru_cache(maxsize=1)
+def _load_env() -> bool:
+    """Load .env once, on first use rather than at import (RuleBasedEnricher needs no keys)."""
+    return load_dotenv()
 
-@dataclass
+
+# Legacy "KEY: value" response lines, matched in a single pass
+_RESP_RE = re.compile(
+    r'^[^\S\n]*(CONTEXTUAL_SUMMARY|SEMANTIC_TAGS|KEY_ENTITIES|CLAUSE_TYPE):(.*)$',
+    re.MULTILINE,
+)
+_RESP_LIST_FIELDS = {"SEMANTIC_TAGS": "semantic_tags", "KEY_ENTITIES": "key_entities"}
+
+# Hashed membership for clause validation; CLAUSE_TYPES stays a list for prompt joining
+_CLAUSE_TYPES_SET = frozenset(CLAUSE_TYPES)
+
+# Rate limiting and transient server errors are worth retrying; other
+# client errors (bad request, auth) are not
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """Return True for transient Gemini failures (429/5xx, timeouts, dropped connections)."""
+    if isinstance(exc, genai_errors.APIError):
+        return exc.code in RETRYABLE_STATUS_CODES
+    return isinstance(exc, (httpx.TimeoutException, httpx.NetworkError, TimeoutError, ConnectionError))
+
+
+@functools.lru_cache(maxsize=4)
+def _get_client(api_key: str) -> genai.Client:
+    """
+    Process-wide Gemini client per API key.
+    
+    Enrichers share it so each new document reuses the warm sync connection
+    pool instead of opening fresh TCP/TLS sessions.
+    """
+    return genai.Client(api_key=api_key)
+
+
+# Exponential backoff with jitter; the final failure is re-raised unchanged
+_llm_retry = retry(
+    retry=retry_if_exception(_is_retryable),
+    wait=wait_random_exponential(multiplier=1, max=30),
+    stop=stop_after_attempt(ENRICHMENT_MAX_ATTEMPTS),
+    reraise=True,
+)
+
+
+class EnrichmentResponse(BaseModel):
+    """
+    JSON schema Gemini is constrained to when enriching a chunk.
+    
+    The schema (field descriptions and the clause_type enum) is sent with each
+    request, so ENRICHMENT_PROMPT does not repeat the output format.
+    """
+    contextual_summary: str = Field(..., description="1-2 sentence summary situating the chunk within the lease")
+    semantic_tags: List[str] = Field(default_factory=list, description="3-5 lowercase, underscore-separated retrieval tags")
+    key_entities: List[str] = Field(default_factory=list, description="Party names, addresses, dates, dollar amounts, percentages")
+    clause_type: Literal[tuple(CLAUSE_TYPES)] = Field(..., description="Clause category that best fits the chunk")
+
+
+# Response schema for grouped requests: one EnrichmentResponse per chunk, in order
+_ENRICHMENT_LIST = TypeAdapter(List[EnrichmentResponse])
+
+
+@dataclass(slots=True, frozen=True)
 class EnrichedChunk:
-    """Represents an enriched document chunk with contextual metadata and source references."""
+    """
+    Represents an enriched document chunk with contextual metadata and source references.
+    
+    Instances are immutable and slotted; source_reference is derived once in
+    __post_init__ since it depends only on the provenance fields.
+    """
     content: str
     original_metadata: dict = field(default_factory=dict)
     token_count: int = 0
@@ -50,9 +148,12 @@ class EnrichedChunk:
     key_entities: List[str] = field(default_factory=list)
     clause_type: str = ""
     
-    @property
-    def source_reference(self) -> str:
-        """Return a formatted source citation for the chunk."""
+    # Derived fields
+    source_reference: str = field(init=False, default="", repr=False, compare=False)
+    _enriched_content: Optional[str] = field(init=False, default=None, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """Build the formatted source citation for the chunk."""
         parts = []
         if self.source_document:
             parts.append(self.source_document)
@@ -62,14 +163,18 @@ class EnrichedChunk:
             pages = ", ".join(str(p) for p in self.page_numbers)
             parts.append(f"p.{pages}")
         parts.append(f"[Chunk {self.chunk_index + 1}]")
-        return " • ".join(parts)
+        object.__setattr__(self, "source_reference", " • ".join(parts))
     
     @property
     def enriched_content(self) -> str:
-        """Return content with contextual prefix for embedding."""
-        if self.contextual_summary:
-            return f"{self.contextual_summary}\n\n{self.content}"
-        return self.content
+        """Return content with contextual prefix for embedding (built on first access)."""
+        if self._enriched_content is None:
+            if self.contextual_summary:
+                value = f"{self.contextual_summary}\n\n{self.content}"
+            else:
+                value = self.content
+            object.__setattr__(self, "_enriched_content", value)
+        return self._enriched_content
     
     def to_dict(self) -> dict:
         """Convert to dictionary for serialization/storage."""
@@ -90,6 +195,72 @@ class EnrichedChunk:
             "clause_type": self.clause_type,
             "original_metadata": self.original_metadata,
         }
+    
+    def to_json_bytes(self) -> bytes:
+        """
+        Serialize to_dict() as UTF-8 JSON with orjson.
+        
+        NumPy values and non-string metadata keys are serialized natively;
+        anything else that isn't JSON is stringified. Append b"\n" to write NDJSON.
+        """
+        return orjson.dumps(
+            self.to_dict(),
+            default=str,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
+
+
+class AsyncRateLimiter:
+    """
+    Token-bucket limiter allowing max_rate acquisitions per time_period seconds.
+    
+    Used as `async with limiter:` around each API request so enrichment runs
+    at the provider's QPM budget instead of sleeping between fixed batches.
+    """
+    
+    def __init__(self, max_rate: float, time_period: float = 60.0):
+        """
+        Initialize the limiter with a full bucket.
+        
+        Args:
+            max_rate: Requests allowed per time period (also the burst size).
+            time_period: Length of the period in seconds.
+        """
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._refill_rate = max_rate / time_period
+        self._tokens = float(max_rate)
+        self._last_refill = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop = None
+    
+    async def acquire(self):
+        """Wait until a request token is available, then consume it."""
+        # Locks bind to an event loop; enrich_chunks runs a fresh loop per call
+        loop = asyncio.get_running_loop()
+        if self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.max_rate,
+                    self._tokens + (now - self._last_refill) * self._refill_rate,
+                )
+                self._last_refill = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._refill_rate)
+    
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
 
 
 class ChunkEnricher:
@@ -100,13 +271,37 @@ class ChunkEnricher:
     is enriched with a contextual summary that situates it within
     the broader document context, improving retrieval accuracy.
     """
+    
+    # Batch job states with usable results, and those after which polling stops
+    BATCH_SUCCESS_STATES = frozenset({
+        types.JobState.JOB_STATE_SUCCEEDED,
+        types.JobState.JOB_STATE_PARTIALLY_SUCCEEDED,
+    })
+    BATCH_DONE_STATES = BATCH_SUCCESS_STATES | {
+        types.JobState.JOB_STATE_FAILED,
+        types.JobState.JOB_STATE_CANCELLED,
+        types.JobState.JOB_STATE_EXPIRED,
+    }
+    
+    # Business-critical tokens (amounts, percentages, capitalised names) that a
+    # near-duplicate clause must share before its cached enrichment is reused
+    FINGERPRINT_RE = re.compile(r'\$[\d,.]+|\d+%|\b[A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+){0,3}\b')
 
     def __init__(
         self,
         model_name: str = DEFAULT_LLM_MODEL,
         doc_title: str = "Commercial Lease Agreement",
         batch_size: int = 5,
-        rate_limit_delay: float = 0.5,
+        requests_per_minute: float = ENRICHMENT_REQUESTS_PER_MINUTE,
+        use_batch_api: bool = ENRICHMENT_USE_BATCH_API,
+        batch_poll_interval: float = ENRICHMENT_BATCH_POLL_SECONDS,
+        cache_path: Optional[str] = ENRICHMENT_CACHE_PATH,
+        cache_similarity: Optional[float] = ENRICHMENT_CACHE_SIMILARITY,
+        cache_min_jaccard: float = ENRICHMENT_CACHE_MIN_JACCARD,
+        embedding_model: str = DEFAULT_EMBEDDING_MODEL,
+        max_content_tokens: int = ENRICHMENT_MAX_CONTENT_TOKENS,
+        request_timeout: Optional[float] = ENRICHMENT_REQUEST_TIMEOUT_SECONDS,
+        chunks_per_request: int = ENRICHMENT_CHUNKS_PER_REQUEST,
     ):
         """
         Initialize the ChunkEnricher.
@@ -114,34 +309,558 @@ class ChunkEnricher:
         Args:
             model_name: Gemini model to use for enrichment.
             doc_title: Title of the document being processed.
-            batch_size: Number of chunks to process in parallel.
-            rate_limit_delay: Delay between batches to avoid rate limits.
+            batch_size: Maximum number of enrichment requests in flight.
+            requests_per_minute: Gemini request budget enforced by the limiter.
+            use_batch_api: Submit all prompts as a single Gemini batch job.
+            batch_poll_interval: Seconds between batch job status checks.
+            cache_path: JSON file persisting enrichment results (None keeps the
+                cache in memory only).
+            cache_similarity: Cosine similarity above which a cached near-duplicate
+                clause is reused (None disables the embedding tier).
+            cache_min_jaccard: Minimum Jaccard overlap of lexical fingerprints
+                required before a similarity hit is accepted.
+            embedding_model: Embedding model used for the similarity tier.
+            max_content_tokens: Token budget for chunk content in each prompt.
+            request_timeout: Seconds an async Gemini call may take before it is
+                abandoned and retried (None waits indefinitely).
+            chunks_per_request: Uncached chunks sent together in one async
+                request (1 sends each chunk on its own).
         """
         self.model_name = model_name
         self.doc_title = doc_title
         self.batch_size = batch_size
-        self.rate_limit_delay = rate_limit_delay
+        self.limiter = AsyncRateLimiter(requests_per_minute, 60.0)
+        self.use_batch_api = use_batch_api
+        self.batch_poll_interval = batch_poll_interval
+        self.max_content_tokens = max_content_tokens
+        self.request_timeout = request_timeout
+        self.chunks_per_request = max(1, chunks_per_request)
         
         # Configure Gemini using new google.genai SDK
+        _load_env()
         api_key = os.getenv("GOOGLE_API_KEY")
         if not api_key:
             raise ValueError("GOOGLE_API_KEY environment variable not set")
         
-        self.client = genai.Client(api_key=api_key)
+        self.client = _get_client(api_key)
+        self._api_key = api_key
+        self._aio_client = None
+        self._aio_loop = None
+        
+        # Split the prompt around its per-chunk fields and substitute the
+        # per-run constants once, so building a prompt is plain concatenation
+        head, rest = ENRICHMENT_PROMPT.split("{chunk_metadata}", 1)
+        middle, tail = rest.split("{chunk_content}", 1)
+        self._prompt_parts = tuple(
+            part.format(doc_title=self.doc_title) for part in (head, middle, tail)
+        )
+        self._group_prompt_parts = tuple(
+            part.format(doc_title=self.doc_title)
+            for part in ENRICHMENT_GROUP_PROMPT.split("{chunks}", 1)
+        )
+        
+        # Constrain responses to the EnrichmentResponse JSON schema
+        self.generation_config = types.GenerateContentConfig(
+            response_mime_type="application/json",
+            response_schema=EnrichmentResponse,
+        )
+        self.group_generation_config = types.GenerateContentConfig(
+            response_mime_type="application/json",
+            response_schema=list[EnrichmentResponse],
+        )
+        
+        # Enrichment cache: exact prompt key (or warmed canonical clause) ->
+        # parsed response, plus a memory-mapped embedding matrix whose rows
+        # point back at cache keys
+        self.cache_path = cache_path
+        self.cache_similarity = cache_similarity
+        self.cache_min_jaccard = cache_min_jaccard
+        self.embedding_model = embedding_model
+        self._cache: Dict[str, dict] = self._load_cache()
+        self._embeddings: Optional[np.ndarray] = self._load_embeddings()
+        self._new_embeddings: List[np.ndarray] = []
+        self._new_matrix: Optional[np.ndarray] = None
+        self._row_keys: List[Optional[str]] = self._index_embedding_rows()
+        
+        # Optionally prefetch enrichments for canonical lease clauses
+        if os.getenv("ENRICHER_WARM") == "1":
+            self.warm_cache(ENRICHMENT_WARM_CORPUS_PATH)
+    
+    @property
+    def aio(self):
+        """
+        Async Gemini client for the running event loop.
+        
+        httpx connection pools bind to the loop that opened them, and the
+        pipeline runs a fresh loop per document, so a pooled connection reused
+        from a closed loop fails with "Event loop is closed". Like
+        AsyncRateLimiter's lock, the async client is rebuilt when the loop changes.
+        Callers that run their own loop close it with aclose() before the loop ends.
+        """
+        loop = asyncio.get_running_loop()
+        if self._aio_loop is not loop:
+            self._aio_client = genai.Client(api_key=self._api_key).aio
+            self._aio_loop = loop
+        return self._aio_client
     
-    def _build_prompt(self, content: str, metadata: dict) -> str:
-        """Build the enrichment prompt for a chunk."""
-        metadata_str = "\n".join(f"  {k}: {v}" for k, v in metadata.items()) if metadata else "  None"
+    async def aclose(self):
+        """
+        Close the async client opened on the running loop, if any.
+        
+        The next `aio` access opens a fresh one. A client left over from
+        another (already closed) loop can't be awaited any more and is only
+        dropped.
+        """
+        client, loop = self._aio_client, self._aio_loop
+        self._aio_client = self._aio_loop = None
+        if client is not None and loop is asyncio.get_running_loop():
+            await client.aclose()
+    
+    # --- Enrichment cache ---
+    
+    def _load_cache(self) -> Dict[str, dict]:
+        """
+        Load the persisted enrichment cache, or start empty.
+        
+        The file holds {"embeddings": <matrix file name>, "entries": {...}};
+        a flat {key: entry} file from before the matrix was versioned is read
+        with the unversioned .embeddings.npy next to it. An unreadable file is
+        moved aside to .corrupt (so the next save can't overwrite it) and
+        reported before starting empty.
+        """
+        self._embeddings_name: Optional[str] = None
+        if not self.cache_path:
+            return {}
+        path = Path(self.cache_path)
+        if not path.exists():
+            return {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if not isinstance(data, dict):
+                raise ValueError("not a JSON object")
+        except (ValueError, OSError) as e:
+            corrupt = path.with_suffix(".json.corrupt")
+            try:
+                os.replace(path, corrupt)
+            except OSError:
+                corrupt = path
+            print(f"⚠️ Enrichment cache {path} is unreadable ({e}); left in {corrupt}, starting empty")
+            return {}
+        if "entries" in data:
+            self._embeddings_name = data.get("embeddings")
+            return data["entries"]
+        self._embeddings_name = path.with_suffix(".embeddings.npy").name
+        return data
+    
+    def _embeddings_path(self) -> Optional[Path]:
+        """Path of the .npy embedding matrix the loaded cache file points at."""
+        if not self.cache_path or not self._embeddings_name:
+            return None
+        return Path(self.cache_path).parent / self._embeddings_name
+    
+    def _load_embeddings(self) -> Optional[np.ndarray]:
+        """Memory-map the persisted embedding matrix (read-only), if any."""
+        path = self._embeddings_path()
+        if path is None or not path.exists():
+            return None
+        try:
+            return np.load(path, mmap_mode="r")
+        except (ValueError, OSError):
+            return None
+    
+    def _index_embedding_rows(self) -> List[Optional[str]]:
+        """Map embedding matrix rows back to cache keys."""
+        n_rows = 0 if self._embeddings is None else self._embeddings.shape[0]
+        row_keys: List[Optional[str]] = [None] * n_rows
+        for key, entry in self._cache.items():
+            # Entries written before the matrix existed carried inline vectors
+            inline = entry.pop("embedding", None)
+            row = entry.get("row")
+            if row is not None and row < n_rows:
+                row_keys[row] = key
+            elif inline:
+                entry["row"] = n_rows + len(self._new_embeddings)
+                self._new_embeddings.append(np.asarray(inline, dtype=np.float32))
+                row_keys.append(key)
+            else:
+                entry["row"] = None
+        return row_keys
+    
+    def save_cache(self):
+        """
+        Persist the enrichment cache to disk (no-op for in-memory caches).
+        
+        The cache file and its embedding matrix are replaced as one unit: new
+        rows go to a fresh, uniquely named matrix file, and the cache file
+        naming it is written to a temp file and renamed into place, like
+        ExtractionCache.put. Readers therefore see either the old pair or the
+        new one, never a matrix whose rows don't match the entries.
+        """
+        if not self.cache_path:
+            return
+        path = Path(self.cache_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        
+        old_embeddings = self._embeddings_path()
+        new_embeddings = None
+        if self._new_embeddings:
+            new_rows = np.stack(self._new_embeddings)
+            matrix = new_rows if self._embeddings is None else np.concatenate([self._embeddings, new_rows])
+            with tempfile.NamedTemporaryFile(
+                dir=path.parent, prefix=f"{path.stem}.embeddings.", suffix=".npy", delete=False
+            ) as f:
+                try:
+                    np.save(f, matrix)
+                except BaseException:
+                    f.close()
+                    os.unlink(f.name)
+                    raise
+            new_embeddings = Path(f.name)
+        
+        cache_file = {
+            "embeddings": new_embeddings.name if new_embeddings else self._embeddings_name,
+            "entries": self._cache,
+        }
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=path.parent, suffix=".json.tmp", delete=False
+        ) as f:
+            try:
+                json.dump(cache_file, f)
+            except BaseException:
+                f.close()
+                os.unlink(f.name)
+                if new_embeddings:
+                    new_embeddings.unlink()
+                raise
+        os.replace(f.name, path)
         
-        return ENRICHMENT_PROMPT.format(
-            doc_title=self.doc_title,
-            chunk_metadata=metadata_str,
-            chunk_content=content[:2000],  # Limit content to avoid token overflow
-            clause_types=", ".join(CLAUSE_TYPES)
+        if new_embeddings:
+            self._embeddings_name = new_embeddings.name
+            self._embeddings = np.load(new_embeddings, mmap_mode="r")
+            self._new_embeddings = []
+            self._new_matrix = None
+            # Other processes may still map the old matrix; it is only unlinked
+            if old_embeddings is not None:
+                try:
+                    old_embeddings.unlink(missing_ok=True)
+                except OSError:
+                    pass
+    
+    def warm_cache(self, corpus_path: str = ENRICHMENT_WARM_CORPUS_PATH) -> int:
+        """
+        Pre-enrich a corpus of canonical lease clauses into the cache.
+        
+        Each JSONL line holds {"content": ..., "metadata": {...}}. A document
+        almost never sends the exact prompt a canonical clause was enriched
+        with (doc title and article headings differ), so warmed enrichments
+        are also stored under a canonical key of the clause text alone,
+        which every chunk consults after an exact miss. Warming therefore pays
+        off whenever a lease reuses a canonical clause verbatim. Setting
+        ENRICHMENT_CACHE_SIMILARITY also reuses them for reworded clauses,
+        at one embedding call per cache miss. Clauses already warmed are
+        skipped, so after the first run this only costs a file read.
+        
+        Args:
+            corpus_path: Path to the canonical clauses JSONL file.
+            
+        Returns:
+            Number of clauses newly enriched.
+        """
+        from ingestion.chunker import Chunk
+        
+        path = Path(corpus_path)
+        if not path.exists():
+            print(f"⚠️ Cache warm corpus not found: {corpus_path}")
+            return 0
+        
+        unwarmed = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                content = record["content"]
+                chunk = Chunk(
+                    content=content,
+                    metadata=record.get("metadata", {}),
+                    token_count=len(content) // 4,
+                )
+                text = self._prompt_content(chunk.content, chunk.token_count)
+                if self._canonical_key(text) not in self._cache:
+                    unwarmed.append((chunk, text))
+        
+        clauses = [c for c, _ in unwarmed if self._chunk_cache_key(c) not in self._cache]
+        if clauses:
+            print(f"🔥 Warming enrichment cache with {len(clauses)} canonical clauses...")
+            self.enrich_chunks(clauses, source_document=path.name)
+        
+        for chunk, text in unwarmed:
+            entry = self._cache.get(self._chunk_cache_key(chunk))
+            if entry is not None:
+                self._cache[self._canonical_key(text)] = {
+                    "parsed": entry["parsed"],
+                    "fingerprint": entry.get("fingerprint", []),
+                    "row": None,
+                }
+        if unwarmed:
+            self.save_cache()
+        return len(clauses)
+    
+    def _cache_key(self, prompt: str) -> str:
+        """
+        Exact-match key for a fully built prompt.
+        
+        The prompt already carries the doc title, chunk metadata and content,
+        so any change to what the model would see is a miss. The model prefix
+        scopes entries to the model that produced them.
+        """
+        digest = hashlib.sha256(f"{self.model_name}\0{prompt}".encode("utf-8")).hexdigest()
+        return f"{self.model_name}:{digest}"
+    
+    def _canonical_key(self, text: str) -> str:
+        """
+        Key of a warmed canonical clause: the (trimmed) prompt content alone.
+        
+        Unlike _cache_key it leaves out the doc title and metadata, so a
+        document quoting the clause verbatim hits it. Only warm_cache stores
+        entries under these keys.
+        """
+        digest = hashlib.sha256(f"{self.model_name}\0{text}".encode("utf-8")).hexdigest()
+        return f"{self.model_name}:canonical:{digest}"
+    
+    def _cached_parsed(self, key: str, text: str) -> Optional[dict]:
+        """Cached enrichment for an exact prompt key, else for a warmed canonical clause."""
+        entry = self._cache.get(key) or self._cache.get(self._canonical_key(text))
+        return entry.get("parsed") if entry else None
+    
+    def _chunk_cache_key(self, chunk) -> str:
+        """Exact-match key of a chunk's single-chunk prompt (see _cache_key)."""
+        text = self._prompt_content(chunk.content, chunk.token_count)
+        return self._cache_key(self._build_prompt(text, chunk.metadata))
+    
+    @_llm_retry
+    def _embed_text(self, text: str) -> List[float]:
+        """Embed one text for the similarity tier, retrying transient failures with backoff."""
+        response = self.client.models.embed_content(
+            model=self.embedding_model,
+            contents=text,
         )
+        return response.embeddings[0].values
+    
+    @_llm_retry
+    async def _embed_text_async(self, text: str) -> List[float]:
+        """Async _embed_text; like _call_llm_async, every attempt takes a limiter token."""
+        async with self.limiter:
+            response = await asyncio.wait_for(
+                self.aio.models.embed_content(
+                    model=self.embedding_model,
+                    contents=text,
+                ),
+                timeout=self.request_timeout,
+            )
+        return response.embeddings[0].values
+    
+    def _embed_for_cache(self, text: str) -> Optional[np.ndarray]:
+        """Return a unit-normalised embedding for the similarity tier, or None."""
+        if self.cache_similarity is None:
+            return None
+        try:
+            return self._normalise(self._embed_text(text))
+        except Exception as e:
+            print(f"Warning: Cache embedding failed: {e}")
+            return None
+    
+    async def _embed_for_cache_async(self, text: str) -> Optional[np.ndarray]:
+        """Async counterpart of _embed_for_cache."""
+        if self.cache_similarity is None:
+            return None
+        try:
+            return self._normalise(await self._embed_text_async(text))
+        except Exception as e:
+            print(f"Warning: Cache embedding failed: {e}")
+            return None
+    
+    @staticmethod
+    def _normalise(values) -> np.ndarray:
+        """Convert an embedding to a float32 unit vector."""
+        vector = np.asarray(values, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def _lexical_fingerprint(self, text: str) -> frozenset:
+        """Extract amounts, percentages and capitalised names from the prompt slice."""
+        return frozenset(self.FINGERPRINT_RE.findall(text))
+    
+    @staticmethod
+    def _jaccard(a: frozenset, b: frozenset) -> float:
+        """Jaccard overlap of two fingerprints (two empty sets count as identical)."""
+        if not a and not b:
+            return 1.0
+        return len(a & b) / len(a | b)
+    
+    def _find_similar(
+        self,
+        embedding: Optional[np.ndarray],
+        fingerprint: frozenset = frozenset(),
+    ) -> Optional[dict]:
+        """
+        Return the parsed response of the most similar cached clause.
+        
+        A candidate must clear the cosine threshold and also agree with the
+        chunk's lexical fingerprint, so clauses that read alike but differ in
+        parties, amounts or percentages are never conflated.
+        """
+        if embedding is None or not self._row_keys:
+            return None
+        
+        # Score persisted (memory-mapped) rows and rows added this session
+        if self._new_embeddings and self._new_matrix is None:
+            self._new_matrix = np.stack(self._new_embeddings)
+        scores = []
+        for matrix in (self._embeddings, self._new_matrix if self._new_embeddings else None):
+            if matrix is None:
+                continue
+            if matrix.shape[1] != embedding.shape[0]:
+                return None
+            scores.append(matrix @ embedding)
+        scores = np.concatenate(scores)
+        
+        prefix = f"{self.model_name}:"
+        candidates = np.flatnonzero(scores > self.cache_similarity)
+        for idx in candidates[np.argsort(-scores[candidates])]:
+            key = self._row_keys[idx]
+            if key is None or not key.startswith(prefix):
+                continue
+            entry = self._cache[key]
+            cached_fp = frozenset(entry.get("fingerprint") or ())
+            if self._jaccard(fingerprint, cached_fp) >= self.cache_min_jaccard:
+                return entry["parsed"]
+        return None
+    
+    def _embedding_dim(self) -> Optional[int]:
+        """Dimension of cached embeddings, or None while the cache has none."""
+        if self._embeddings is not None:
+            return self._embeddings.shape[1]
+        if self._new_embeddings:
+            return self._new_embeddings[0].shape[0]
+        return None
+    
+    def _cache_store(
+        self,
+        key: str,
+        parsed: dict,
+        embedding: Optional[np.ndarray] = None,
+        fingerprint: frozenset = frozenset(),
+    ):
+        """Record a parsed response under its exact key (and embedding, if any)."""
+        row = None
+        dim = self._embedding_dim()
+        if embedding is not None and (dim is None or dim == embedding.shape[0]):
+            row = len(self._row_keys)
+            self._new_embeddings.append(embedding)
+            self._new_matrix = None
+            self._row_keys.append(key)
+        
+        self._cache[key] = {
+            "parsed": parsed,
+            "fingerprint": sorted(fingerprint),
+            "row": row,
+        }
+    
+    def _prompt_content(self, content: str, token_count: int = 0) -> str:
+        """
+        Trim chunk content to the prompt's token budget.
+        
+        Uses the chunk's own token count (estimated from its length if unknown)
+        to find the character offset of max_content_tokens, then backs off to
+        the preceding whitespace so no word is cut in half.
+        
+        Args:
+            content: The chunk content.
+            token_count: Token count of the chunk, if already known.
+            
+        Returns:
+            The content, truncated if it exceeds the token budget.
+        """
+        if token_count <= 0:
+            token_count = len(content) >> 2
+        if token_count <= self.max_content_tokens:
+            return content
+        
+        cut = len(content) * self.max_content_tokens // token_count
+        boundary = max(content.rfind(" ", 0, cut + 1), content.rfind("\n", 0, cut + 1))
+        return content[:boundary] if boundary > 0 else content[:cut]
+    
+    @staticmethod
+    def _metadata_str(metadata: dict) -> str:
+        """Render chunk metadata as indented "key: value" lines for a prompt."""
+        return "\n".join(f"  {k}: {v}" for k, v in metadata.items()) if metadata else "  None"
+    
+    def _build_prompt(self, text: str, metadata: dict) -> str:
+        """Build the enrichment prompt for a chunk's (already trimmed) prompt content."""
+        head, middle, tail = self._prompt_parts
+        return f"{head}{self._metadata_str(metadata)}{middle}{text}{tail}"
+    
+    def _build_group_prompt(self, texts: List[str], metadatas: List[dict]) -> str:
+        """Build one prompt asking for a JSON array enriching every chunk in order."""
+        head, tail = self._group_prompt_parts
+        chunks = "\n".join(
+            ENRICHMENT_GROUP_CHUNK.format(
+                index=i,
+                chunk_metadata=self._metadata_str(metadata),
+                chunk_content=text,
+            )
+            for i, (text, metadata) in enumerate(zip(texts, metadatas))
+        )
+        return f"{head}{chunks}{tail}"
     
     def _parse_response(self, response_text: str) -> dict:
-        """Parse the structured response from Gemini."""
+        """
+        Parse the JSON response from Gemini.
+        
+        Falls back to the legacy line format if the text is not valid JSON
+        for the schema (e.g. a model without structured output support).
+        Validation runs in pydantic-core's compiled JSON parser; text that
+        cannot be a JSON object skips it rather than paying for a failed
+        validation.
+        """
+        if not response_text.lstrip().startswith("{"):
+            return self._parse_line_response(response_text)
+        try:
+            response = EnrichmentResponse.model_validate_json(response_text)
+        except ValidationError:
+            return self._parse_line_response(response_text)
+        return self._response_to_dict(response)
+    
+    def _parse_group_response(self, response_text: str, expected: int) -> Optional[List[dict]]:
+        """
+        Parse a grouped response into one dict per chunk.
+        
+        Returns None unless the text is a JSON array of exactly `expected`
+        schema-valid objects, since results can only be matched to chunks by position.
+        """
+        try:
+            responses = _ENRICHMENT_LIST.validate_json(response_text)
+        except ValidationError:
+            return None
+        if len(responses) != expected:
+            return None
+        return [self._response_to_dict(response) for response in responses]
+    
+    @staticmethod
+    def _response_to_dict(response: EnrichmentResponse) -> dict:
+        """Normalise a validated EnrichmentResponse into the parsed-result dict."""
+        clause = response.clause_type.strip().lower()
+        return {
+            "contextual_summary": response.contextual_summary.strip(),
+            "semantic_tags": [t.strip() for t in response.semantic_tags if t.strip()],
+            "key_entities": [e.strip() for e in response.key_entities if e.strip()],
+            "clause_type": clause if clause in _CLAUSE_TYPES_SET else "other",
+        }
+    
+    def _parse_line_response(self, response_text: str) -> dict:
+        """Parse a legacy "KEY: value" line-formatted response."""
         result = {
             "contextual_summary": "",
             "semantic_tags": [],
@@ -149,31 +868,93 @@ class ChunkEnricher:
             "clause_type": "other"
         }
         
-        lines = response_text.strip().split("\n")
-        for line in lines:
-            line = line.strip()
-            
-            if line.startswith("CONTEXTUAL_SUMMARY:"):
-                result["contextual_summary"] = line.replace("CONTEXTUAL_SUMMARY:", "").strip()
-            
-            elif line.startswith("SEMANTIC_TAGS:"):
-                tags_str = line.replace("SEMANTIC_TAGS:", "").strip()
-                # Parse [tag1, tag2] format
-                tags_str = tags_str.strip("[]")
-                result["semantic_tags"] = [t.strip() for t in tags_str.split(",") if t.strip()]
-            
-            elif line.startswith("KEY_ENTITIES:"):
-                entities_str = line.replace("KEY_ENTITIES:", "").strip()
-                entities_str = entities_str.strip("[]")
-                result["key_entities"] = [e.strip() for e in entities_str.split(",") if e.strip()]
+        # One pass over the response; later lines override earlier ones
+        for match in _RESP_RE.finditer(response_text):
+            key, value = match.group(1), match.group(2).strip()
             
-            elif line.startswith("CLAUSE_TYPE:"):
-                clause = line.replace("CLAUSE_TYPE:", "").strip().lower()
-                if clause in CLAUSE_TYPES:
+            if key == "CLAUSE_TYPE":
+                clause = value.lower()
+                if clause in _CLAUSE_TYPES_SET:
                     result["clause_type"] = clause
+            elif key == "CONTEXTUAL_SUMMARY":
+                result["contextual_summary"] = value
+            else:
+                # Parse [item1, item2] format
+                items = value.strip("[]").split(",")
+                result[_RESP_LIST_FIELDS[key]] = [t.strip() for t in items if t.strip()]
         
         return result
     
+    @_llm_retry
+    def _call_llm(self, prompt: str) -> str:
+        """Generate an enrichment response, retrying transient failures with backoff."""
+        # Use new google.genai SDK client API
+        response = self.client.models.generate_content(
+            model=self.model_name,
+            contents=prompt,
+            config=self.generation_config,
+        )
+        return response.text
+    
+    @_llm_retry
+    async def _call_llm_async(
+        self,
+        prompt: str,
+        config: Optional[types.GenerateContentConfig] = None,
+    ) -> str:
+        """
+        Async _call_llm; every attempt takes a token from the QPM limiter.
+        
+        The deadline covers only the request itself, not the limiter wait. A
+        stalled call raises TimeoutError, which _llm_retry treats as transient.
+        `config` overrides the single-chunk generation_config (used for grouped requests).
+        """
+        async with self.limiter:
+            response = await asyncio.wait_for(
+                self.aio.models.generate_content(
+                    model=self.model_name,
+                    contents=prompt,
+                    config=config or self.generation_config,
+                ),
+                timeout=self.request_timeout,
+            )
+        return response.text
+    
+    def _build_enriched_chunk(
+        self,
+        content: str,
+        metadata: dict,
+        token_count: int,
+        parsed: Optional[dict],
+        chunk_index: int = 0,
+        source_document: str = "",
+        char_start: int = 0,
+        char_end: int = 0,
+        page_numbers: Optional[List[int]] = None,
+    ) -> EnrichedChunk:
+        """Build an EnrichedChunk from a parsed response (None leaves it unenriched)."""
+        # Extract section reference from metadata
+        source_section = metadata.get("article", "") or metadata.get("section", "")
+        parsed = parsed or {}
+        
+        return EnrichedChunk(
+            content=content,
+            original_metadata=metadata,
+            token_count=token_count,
+            # Source reference fields
+            chunk_index=chunk_index,
+            source_document=source_document,
+            source_section=source_section,
+            char_start=char_start,
+            char_end=char_end,
+            page_numbers=page_numbers or [],
+            # Enrichment fields
+            contextual_summary=parsed.get("contextual_summary", ""),
+            semantic_tags=parsed.get("semantic_tags", []),
+            key_entities=parsed.get("key_entities", []),
+            clause_type=parsed.get("clause_type", ""),
+        )
+    
     def enrich_chunk(
         self,
         content: str,
@@ -201,76 +982,158 @@ class ChunkEnricher:
         Returns:
             EnrichedChunk with contextual enrichments and source references.
         """
-        prompt = self._build_prompt(content, metadata)
+        text = self._prompt_content(content, token_count)
+        prompt = self._build_prompt(text, metadata)
+        key = self._cache_key(prompt)
+        parsed = self._cached_parsed(key, text)
         
-        # Extract section reference from metadata
-        source_section = metadata.get("article", "") or metadata.get("section", "")
+        if parsed is None:
+            embedding = self._embed_for_cache(text)
+            fingerprint = self._lexical_fingerprint(text)
+            parsed = self._find_similar(embedding, fingerprint)
+            if parsed is None:
+                try:
+                    parsed = self._parse_response(self._call_llm(prompt))
+                except Exception as e:
+                    print(f"Warning: Enrichment failed for chunk {chunk_index}: {e}")
+                    # Return unenriched chunk on failure
+                    parsed = None
+            if parsed is not None:
+                self._cache_store(key, parsed, embedding, fingerprint)
         
-        try:
-            # Use new google.genai SDK client API
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=prompt,
-            )
-            parsed = self._parse_response(response.text)
+        return self._build_enriched_chunk(
+            content,
+            metadata,
+            token_count,
+            parsed,
+            chunk_index=chunk_index,
+            source_document=source_document,
+            char_start=char_start,
+            char_end=char_end,
+            page_numbers=page_numbers,
+        )
+    
+    async def _generate_group_async(
+        self,
+        indices: List[int],
+        texts: List[str],
+        metadatas: List[dict],
+        prompts: List[str],
+    ) -> List[Optional[dict]]:
+        """
+        Call Gemini for chunks that missed the cache, several per request.
+        
+        Multiple chunks go out as one grouped prompt returning a JSON array. If
+        the array is malformed or the wrong length, each chunk is retried with
+        its own prompt. A chunk whose request fails comes back as None.
+        
+        Args:
+            indices: Chunk indices (for warnings).
+            texts: Trimmed prompt content per chunk.
+            metadatas: Chunk metadata per chunk.
+            prompts: Single-chunk prompts, used alone or as the fallback.
             
-            return EnrichedChunk(
-                content=content,
-                original_metadata=metadata,
-                token_count=token_count,
-                # Source reference fields
-                chunk_index=chunk_index,
-                source_document=source_document,
-                source_section=source_section,
-                char_start=char_start,
-                char_end=char_end,
-                page_numbers=page_numbers or [],
-                # Enrichment fields
-                contextual_summary=parsed["contextual_summary"],
-                semantic_tags=parsed["semantic_tags"],
-                key_entities=parsed["key_entities"],
-                clause_type=parsed["clause_type"],
+        Returns:
+            Parsed enrichment dicts (or None) in input order.
+        """
+        if len(prompts) > 1:
+            try:
+                response_text = await self._call_llm_async(
+                    self._build_group_prompt(texts, metadatas),
+                    self.group_generation_config,
+                )
+            except Exception as e:
+                print(f"Warning: Enrichment failed for chunks {indices}: {e}")
+                return [None] * len(prompts)
+            parsed = self._parse_group_response(response_text, len(prompts))
+            if parsed is not None:
+                return parsed
+            print(f"⚠️ Grouped enrichment response did not match chunks {indices}; retrying individually")
+        
+        async def single(chunk_index: int, prompt: str) -> Optional[dict]:
+            try:
+                return self._parse_response(await self._call_llm_async(prompt))
+            except Exception as e:
+                print(f"Warning: Enrichment failed for chunk {chunk_index}: {e}")
+                return None
+        
+        return list(await asyncio.gather(*(
+            single(chunk_index, prompt) for chunk_index, prompt in zip(indices, prompts)
+        )))
+    
+    async def _enrich_group_async(
+        self,
+        group: List[Tuple[int, object]],
+        source_document: str,
+    ) -> List[EnrichedChunk]:
+        """
+        Enrich a group of chunks using the native async Gemini client.
+        
+        Each chunk goes through the same cache tiers as enrich_chunk; only
+        the misses reach the LLM, together in one request (see
+        _generate_group_async). Results are cached under each chunk's own
+        single-chunk prompt key, so they are shared with enrich_chunk.
+        
+        Args:
+            group: (chunk_index, Chunk) pairs.
+            source_document: Original document filename for provenance.
+            
+        Returns:
+            EnrichedChunk objects in group order.
+        """
+        chunks = [c for _, c in group]
+        texts = [self._prompt_content(c.content, c.token_count) for c in chunks]
+        prompts = [self._build_prompt(text, c.metadata) for text, c in zip(texts, chunks)]
+        keys = [self._cache_key(prompt) for prompt in prompts]
+        parsed = [self._cached_parsed(key, text) for key, text in zip(keys, texts)]
+        
+        misses = [j for j, p in enumerate(parsed) if p is None]
+        embeddings = await asyncio.gather(*(self._embed_for_cache_async(texts[j]) for j in misses))
+        fingerprints = [self._lexical_fingerprint(texts[j]) for j in misses]
+        
+        uncached = []
+        for j, embedding, fingerprint in zip(misses, embeddings, fingerprints):
+            parsed[j] = self._find_similar(embedding, fingerprint)
+            if parsed[j] is None:
+                uncached.append(j)
+        
+        if uncached:
+            generated = await self._generate_group_async(
+                [group[j][0] for j in uncached],
+                [texts[j] for j in uncached],
+                [chunks[j].metadata for j in uncached],
+                [prompts[j] for j in uncached],
             )
-        except Exception as e:
-            print(f"Warning: Enrichment failed for chunk {chunk_index}: {e}")
-            # Return unenriched chunk on failure
-            return EnrichedChunk(
-                content=content,
-                original_metadata=metadata,
-                token_count=token_count,
+            for j, result in zip(uncached, generated):
+                parsed[j] = result
+        
+        for j, embedding, fingerprint in zip(misses, embeddings, fingerprints):
+            if parsed[j] is not None:
+                self._cache_store(keys[j], parsed[j], embedding, fingerprint)
+        
+        return [
+            self._build_enriched_chunk(
+                c.content,
+                c.metadata,
+                c.token_count,
+                result,
                 chunk_index=chunk_index,
                 source_document=source_document,
-                source_section=source_section,
-                char_start=char_start,
-                char_end=char_end,
-                page_numbers=page_numbers or [],
             )
+            for (chunk_index, c), result in zip(group, parsed)
+        ]
     
-    async def _enrich_chunk_async(
-        self,
-        content: str,
-        metadata: dict,
-        token_count: int,
-        chunk_index: int,
-        source_document: str,
-    ) -> EnrichedChunk:
-        """Async wrapper for chunk enrichment."""
-        return await asyncio.to_thread(
-            self.enrich_chunk,
-            content,
-            metadata,
-            token_count,
-            chunk_index,
-            source_document,
-        )
-    
-    async def enrich_chunks_async(
+    async def _enrich_chunks_batch_job(
         self,
         chunks: List,
         source_document: str = "",
     ) -> List[EnrichedChunk]:
         """
-        Enrich multiple chunks asynchronously with rate limiting.
+        Enrich all chunks through a single Gemini Batch API job.
+        
+        Every prompt is submitted as an inlined request in one job, which is
+        then polled until it reaches a terminal state. Responses come back in
+        request order and are zipped with the chunks through _parse_response.
         
         Args:
             chunks: List of Chunk objects (from DocumentChunker).
@@ -278,34 +1141,270 @@ class ChunkEnricher:
             
         Returns:
             List of EnrichedChunk objects with source references.
+            
+        Raises:
+            RuntimeError: If the batch job does not succeed.
         """
+        texts = [self._prompt_content(c.content, c.token_count) for c in chunks]
+        prompts = [self._build_prompt(text, c.metadata) for text, c in zip(texts, chunks)]
+        requests = [
+            types.InlinedRequest(contents=prompt, config=self.generation_config)
+            for prompt in prompts
+        ]
+        job = await self.aio.batches.create(
+            model=self.model_name,
+            src=requests,
+            config=types.CreateBatchJobConfig(display_name=f"enrich-{source_document or 'chunks'}"),
+        )
+        print(f"📦 Submitted batch job {job.name} ({len(requests)} chunks)")
+        
+        while job.state not in self.BATCH_DONE_STATES:
+            await asyncio.sleep(self.batch_poll_interval)
+            job = await self.aio.batches.get(name=job.name)
+        
+        if job.state not in self.BATCH_SUCCESS_STATES:
+            raise RuntimeError(f"Batch job {job.name} ended in state {job.state}: {job.error}")
+        
+        responses = (job.dest and job.dest.inlined_responses) or []
+        if len(responses) != len(chunks):
+            raise RuntimeError(f"Batch job {job.name} returned {len(responses)} of {len(chunks)} responses")
+        
         enriched = []
-        total = len(chunks)
+        for i, (c, text, prompt, item) in enumerate(zip(chunks, texts, prompts, responses)):
+            parsed = None
+            if item.response is not None and item.response.text:
+                parsed = self._parse_response(item.response.text)
+                self._cache_store(
+                    self._cache_key(prompt),
+                    parsed,
+                    fingerprint=self._lexical_fingerprint(text),
+                )
+            else:
+                print(f"Warning: Enrichment failed for chunk {i}: {item.error}")
+            enriched.append(self._build_enriched_chunk(
+                c.content,
+                c.metadata,
+                c.token_count,
+                parsed,
+                chunk_index=i,
+                source_document=source_document,
+            ))
         
-        for i in range(0, total, self.batch_size):
-            batch = chunks[i:i + self.batch_size]
+        print(f"Enriched {len(enriched)}/{len(chunks)} chunks")
+        return enriched
+    
+    @staticmethod
+    def _copy_result(result: EnrichedChunk, chunk_index: int, chunk) -> EnrichedChunk:
+        """Copy a result to a duplicate chunk that sent the same prompt."""
+        return replace(
+            result,
+            # Content past the prompt's token budget may still differ
+            content=chunk.content,
+            original_metadata=chunk.metadata,
+            token_count=chunk.token_count,
+            chunk_index=chunk_index,
+            source_section=chunk.metadata.get("article", "") or chunk.metadata.get("section", ""),
+        )
+    
+    async def enrich_chunks_stream(
+        self,
+        chunks: List,
+        source_document: str = "",
+    ) -> AsyncIterator[EnrichedChunk]:
+        """
+        Enrich chunks concurrently, yielding each EnrichedChunk as it completes.
+        
+        Chunks that would send an identical prompt (same content and
+        metadata) are enriched once and copied to each position. Up to
+        chunks_per_request chunks share one request, and at most batch_size
+        requests are in flight (and held in memory) at once; pacing is left to
+        the QPM limiter. Results arrive in completion order, so use chunk_index
+        to restore document order. When use_batch_api is set, all prompts go out as one Gemini batch job instead; if the SDK or
+        service rejects the job, this falls back to per-chunk requests.
+        
+        Args:
+            chunks: List of Chunk objects (from DocumentChunker).
+            source_document: Original document filename for provenance.
             
-            # Process batch in parallel with chunk indices
-            tasks = [
-                self._enrich_chunk_async(
-                    c.content,
-                    c.metadata,
-                    c.token_count,
-                    chunk_index=i + j,
-                    source_document=source_document,
-                )
-                for j, c in enumerate(batch)
+        Yields:
+            EnrichedChunk objects with source references.
+        """
+        # Chunks that would send the same prompt (same content and metadata)
+        # are enriched once and fanned back out
+        duplicates: Dict[int, List[int]] = {}
+        first_seen: Dict[str, int] = {}
+        for i, c in enumerate(chunks):
+            key = self._chunk_cache_key(c)
+            if key in first_seen:
+                duplicates[first_seen[key]].append(i)
+            else:
+                first_seen[key] = i
+                duplicates[i] = []
+        unique = list(duplicates)
+        
+        def fan_out(result: EnrichedChunk) -> List[EnrichedChunk]:
+            """Return the result plus copies for each duplicate position."""
+            return [result] + [
+                self._copy_result(result, j, chunks[j]) for j in duplicates[result.chunk_index]
             ]
-            batch_results = await asyncio.gather(*tasks)
-            enriched.extend(batch_results)
-            
-            # Progress update
-            print(f"Enriched {min(i + self.batch_size, total)}/{total} chunks")
+        
+        if self.use_batch_api and chunks:
+            try:
+                enriched = await self._enrich_chunks_batch_job(
+                    [chunks[i] for i in unique], source_document
+                )
+            except Exception as e:
+                print(f"⚠️ Batch enrichment unavailable, falling back to per-chunk requests: {e}")
+            else:
+                self.save_cache()
+                for i, result in zip(unique, enriched):
+                    for chunk in fan_out(replace(result, chunk_index=i)):
+                        yield chunk
+                return
+        
+        remaining = iter(unique)
+        pending = set()
+        progress = atqdm(total=len(chunks), desc="Enriching", unit="chunk")
+        
+        try:
+            while True:
+                # Top up the in-flight requests with groups of remaining unique chunks
+                while len(pending) < self.batch_size:
+                    group = [(i, chunks[i]) for i in itertools.islice(remaining, self.chunks_per_request)]
+                    if not group:
+                        break
+                    pending.add(asyncio.create_task(self._enrich_group_async(group, source_document)))
+                if not pending:
+                    break
+                
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    for result in task.result():
+                        copies = fan_out(result)
+                        progress.update(len(copies))
+                        for chunk in copies:
+                            yield chunk
+        finally:
+            progress.close()
+            # Consumer stopped early: don't leave requests running
+            for task in pending:
+                task.cancel()
+        
+        self.save_cache()
+    
+    async def enrich_from_queue(
+        self,
+        queue: asyncio.Queue,
+        source_document: str = "",
+    ) -> AsyncIterator[EnrichedChunk]:
+        """
+        Enrich chunks as a producer puts them on a queue, yielding results.
+        
+        Lets chunking (or any other producer) overlap with the network-bound
+        enrichment calls. Chunks are numbered in arrival order; the producer
+        puts None once it is done. At most batch_size requests are in flight,
+        and new chunks are picked up while earlier requests are still running.
+        A progress bar advances as each request completes. As in
+        enrich_chunks_stream, a chunk that would send the same prompt as an
+        earlier one is not requested again but gets a copy of its result.
+        
+        Args:
+            queue: Queue of Chunk objects, terminated by a None sentinel.
+            source_document: Original document filename for provenance.
             
-            # Rate limit delay between batches
-            if i + self.batch_size < total:
-                await asyncio.sleep(self.rate_limit_delay)
+        Yields:
+            EnrichedChunk objects in completion order.
+        """
+        pending = set()
+        getter = None
+        next_index = 0
+        exhausted = False
+        # Prompt key -> index of its first chunk, and the duplicates waiting on it
+        first_seen: Dict[str, int] = {}
+        duplicates: Dict[int, List[Tuple[int, object]]] = {}
+        # Results of first occurrences, for duplicates that arrive after them
+        finished: Dict[int, EnrichedChunk] = {}
+        # The total grows as chunks arrive, since the producer's count isn't known upfront
+        progress = atqdm(total=0, desc="Enriching", unit="chunk")
+        
+        try:
+            while True:
+                # Keep one queue read outstanding while there is room in flight
+                if getter is None and not exhausted and len(pending) < self.batch_size:
+                    getter = asyncio.create_task(queue.get())
+                waiting = pending | {getter} if getter else pending
+                if not waiting:
+                    break
+                
+                done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                
+                if getter in done:
+                    c = getter.result()
+                    getter = None
+                    # Group the arrived chunk with any others already queued
+                    group = []
+                    ready = []
+                    while c is not None:
+                        key = self._chunk_cache_key(c)
+                        first = first_seen.get(key)
+                        if first is None:
+                            first_seen[key] = next_index
+                            duplicates[next_index] = []
+                            group.append((next_index, c))
+                        elif first in finished:
+                            ready.append(self._copy_result(finished[first], next_index, c))
+                        else:
+                            duplicates[first].append((next_index, c))
+                        next_index += 1
+                        if len(group) >= self.chunks_per_request or queue.empty():
+                            break
+                        c = queue.get_nowait()
+                    if c is None:
+                        exhausted = True
+                    if group:
+                        pending.add(asyncio.create_task(self._enrich_group_async(group, source_document)))
+                    progress.total = next_index
+                    progress.refresh()
+                    progress.update(len(ready))
+                    for result in ready:
+                        yield result
+                
+                for task in done & pending:
+                    pending.discard(task)
+                    for result in task.result():
+                        finished[result.chunk_index] = result
+                        copies = [result] + [
+                            self._copy_result(result, j, c)
+                            for j, c in duplicates.pop(result.chunk_index)
+                        ]
+                        progress.update(len(copies))
+                        for chunk in copies:
+                            yield chunk
+        finally:
+            progress.close()
+            # Consumer stopped early: don't leave requests or the queue read running
+            for task in pending | ({getter} if getter else set()):
+                task.cancel()
         
+        self.save_cache()
+    
+    async def enrich_chunks_async(
+        self,
+        chunks: List,
+        source_document: str = "",
+    ) -> List[EnrichedChunk]:
+        """
+        Enrich multiple chunks concurrently within the QPM budget.
+        
+        Args:
+            chunks: List of Chunk objects (from DocumentChunker).
+            source_document: Original document filename for provenance.
+            
+        Returns:
+            List of EnrichedChunk objects with source references, in chunk order.
+        """
+        enriched = [c async for c in self.enrich_chunks_stream(chunks, source_document)]
+        enriched.sort(key=lambda c: c.chunk_index)
         return enriched
     
     def enrich_chunks(self, chunks: List, source_document: str = "") -> List[EnrichedChunk]:
@@ -319,7 +1418,14 @@ class ChunkEnricher:
         Returns:
             List of EnrichedChunk objects with source references.
         """
-        return asyncio.run(self.enrich_chunks_async(chunks, source_document))
+        async def run() -> List[EnrichedChunk]:
+            try:
+                return await self.enrich_chunks_async(chunks, source_document)
+            finally:
+                # The loop ends with this call, so release its connections
+                await self.aclose()
+        
+        return asyncio.run(run())
 
 
 class RuleBasedEnricher:
@@ -348,6 +1454,13 @@ class RuleBasedEnricher:
         "parties_recitals": ["parties", "recital", "whereas", "landlord", "tenant", "lessor", "lessee"],
     }
     
+    # (keyword, clause_type) pairs flattened once, in CLAUSE_PATTERNS priority order
+    CLAUSE_KEYWORDS = tuple(
+        (keyword, clause_type)
+        for clause_type, keywords in CLAUSE_PATTERNS.items()
+        for keyword in keywords
+    )
+    
     # Regex patterns for entity extraction
     ENTITY_PATTERNS = {
         "money": r'\$[\d,]+(?:\.\d{2})?',
@@ -356,6 +1469,25 @@ class RuleBasedEnricher:
         "sqft": r'[\d,]+\s*(?:square feet|sq\.?\s*ft\.?|sf)',
     }
     
+    # All entity patterns fused into one named-group alternation so each chunk
+    # is scanned once; match.lastgroup gives the entity type. The leading
+    # lookahead lists every character an entity can start with ($, digits,
+    # commas, month initials) so other positions are skipped without trying
+    # each alternative; extend it when adding a pattern
+    ENTITY_RE = re.compile(
+        r"(?=[$\d,jfmasond])(?:"
+        + "|".join(f"(?P<{name}>{pattern})" for name, pattern in ENTITY_PATTERNS.items())
+        + ")",
+        re.IGNORECASE,
+    )
+    
+    # Semantic tag implied by each entity type (types without one add no tag)
+    ENTITY_TAGS = {
+        "money": "financial_terms",
+        "date": "dates",
+        "sqft": "space_requirements",
+    }
+    
     def __init__(self, doc_title: str = "Commercial Lease Agreement"):
         """Initialize the rule-based enricher."""
         self.doc_title = doc_title
@@ -370,20 +1502,29 @@ class RuleBasedEnricher:
             search_text += metadata["section"].lower() + " "
         search_text += content[:200].lower()
         
-        for clause_type, keywords in self.CLAUSE_PATTERNS.items():
-            for keyword in keywords:
-                if keyword in search_text:
-                    return clause_type
+        for keyword, clause_type in self.CLAUSE_KEYWORDS:
+            if keyword in search_text:
+                return clause_type
         return "other"
     
     def _extract_entities(self, content: str) -> List[str]:
-        """Extract entities using regex patterns."""
-        import re
-        entities = []
-        for entity_type, pattern in self.ENTITY_PATTERNS.items():
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            for match in matches[:3]:
-                entities.append(f"{entity_type}: {match}")
+        """Extract entities using regex patterns (at most 3 per type, 10 total)."""
+        by_type: Dict[str, List[str]] = {entity_type: [] for entity_type in self.ENTITY_PATTERNS}
+        remaining = 3 * len(by_type)
+        for match in self.ENTITY_RE.finditer(content):
+            found = by_type[match.lastgroup]
+            if len(found) < 3:
+                found.append(match.group())
+                remaining -= 1
+                if not remaining:
+                    break  # every type is capped; the rest of the chunk can't change the result
+        
+        # Grouped by type in ENTITY_PATTERNS order, as before
+        entities = [
+            f"{entity_type}: {value}"
+            for entity_type, values in by_type.items()
+            for value in values
+        ]
         return entities[:10]
     
     def _generate_summary(self, content: str, metadata: dict, clause_type: str) -> str:
@@ -402,16 +1543,16 @@ class RuleBasedEnricher:
         return "This section is part of the lease agreement."
     
     def _generate_tags(self, clause_type: str, entities: List[str]) -> List[str]:
-        """Generate semantic tags from clause type and entities."""
-        tags = [clause_type]
+        """Generate semantic tags from clause type and entities (first-seen order, at most 5)."""
+        # dict keys keep insertion order and drop duplicates
+        tags = {clause_type: None}
         for entity in entities:
-            if entity.startswith("money:"):
-                tags.append("financial_terms")
-            elif entity.startswith("date:"):
-                tags.append("dates")
-            elif entity.startswith("sqft:"):
-                tags.append("space_requirements")
-        return list(set(tags))[:5]
+            tag = self.ENTITY_TAGS.get(entity.partition(":")[0])
+            if tag:
+                tags[tag] = None
+                if len(tags) == 5:
+                    break
+        return list(tags)
     
     def enrich_chunk(
         self,
@@ -449,17 +1590,17 @@ class RuleBasedEnricher:
     
     def enrich_chunks(self, chunks: List, source_document: str = "") -> List[EnrichedChunk]:
         """Enrich multiple chunks (instant, no rate limiting needed)."""
-        enriched = []
-        for i, chunk in enumerate(chunks):
-            enriched_chunk = self.enrich_chunk(
+        enrich = self.enrich_chunk
+        return [
+            enrich(
                 content=chunk.content,
                 metadata=chunk.metadata,
                 token_count=chunk.token_count,
                 chunk_index=i,
                 source_document=source_document,
             )
-            enriched.append(enriched_chunk)
-        return enriched
+            for i, chunk in enumerate(chunks)
+        ]
 
 
 def get_enricher(mode: str = None, doc_title: str = "Commercial Lease Agreement"):
@@ -505,25 +1646,32 @@ if __name__ == "__main__":
         with open(test_file, "r", encoding="utf-8") as f:
             text = f.read()
         
-        # Create chunks
         chunker = DocumentChunker()
-        chunks = chunker.chunk(text)
-        print(f"Created {len(chunks)} chunks")
-        
-        # Enrich first 3 chunks as a test
         enricher = ChunkEnricher()
-        test_chunks = chunks[:3]
         
-        print("\n--- Testing Enrichment with Source References ---")
-        for i, chunk in enumerate(test_chunks):
-            enriched = enricher.enrich_chunk(
-                chunk.content,
-                chunk.metadata,
-                chunk.token_count,
-                chunk_index=i,
-                source_document=source_doc,
-            )
+        # Chunk and enrich concurrently: the chunker feeds the first 3 chunks
+        # into a queue while the enricher is already working on them
+        async def chunk_and_enrich(limit: int = 3) -> List[EnrichedChunk]:
+            queue: asyncio.Queue = asyncio.Queue(maxsize=enricher.batch_size)
+            
+            async def produce():
+                try:
+                    for i, chunk in enumerate(chunker.iter_chunks(text)):
+                        if i == limit:
+                            break
+                        await queue.put(chunk)
+                finally:
+                    await queue.put(None)
             
+            producer = asyncio.create_task(produce())
+            results = [c async for c in enricher.enrich_from_queue(queue, source_document=source_doc)]
+            await producer
+            return sorted(results, key=lambda c: c.chunk_index)
+        
+        test_chunks = asyncio.run(chunk_and_enrich())
+        
+        print("\n--- Testing Enrichment with Source References ---")
+        for i, enriched in enumerate(test_chunks):
             print(f"\n{'='*60}")
             print(f"CHUNK {i+1}")
             print(f"{'='*60}")
@@ -538,5 +1686,4 @@ if __name__ == "__main__":
             # Show the to_dict output for first chunk
             if i == 0:
                 print(f"\n--- JSON Serialization Example ---")
-                import json
-                print(json.dumps(enriched.to_dict(), indent=2, default=str)[:500] + "...")
\ No newline at end of file
+                print(orjson.dumps(enriched.to_dict(), option=orjson.OPT_INDENT_2, default=str).decode()[:500] + "...")
\ No newline at end of file
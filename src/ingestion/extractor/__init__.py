@@ -5,8 +5,18 @@ Re-exports for backward compatibility with existing code that imports from:
     from ingestion.extractor import LeaseExtractor, ClauseExtractor, Lease
 """
 
+try:
+    import langchain_google_genai  # noqa: F401
+except ImportError:
+    # Fall back to packages installed with `pip install --user`; probed only
+    # when the import fails, not on every import of the package
+    import site
+    import sys
+    sys.path.append(site.getusersitepackages())
+
 from .lease_extractor import LeaseExtractor, Lease, RentStep
 from .clause_extractor import ClauseExtractor, ExtractedClause, ExtractedClauses, STANDARD_CLAUSE_TYPES
+from .extraction_cache import ExtractionCache
 
 __all__ = [
     "LeaseExtractor",
@@ -16,4 +26,5 @@ __all__ = [
     "ExtractedClause",
     "ExtractedClauses",
     "STANDARD_CLAUSE_TYPES",
+    "ExtractionCache",
 ]
@@ -5,28 +5,23 @@ Extracts clause summaries for lease comparison.
 Contains ExtractedClause, ExtractedClauses models and ClauseExtractor class.
 """
 
-from typing import List, Optional
-from pydantic import BaseModel, Field
+from typing import Dict, List, Optional, Tuple
+from pydantic import BaseModel, Field, ValidationError
 import os
 import sys
-import site
 
-# Ensure user site-packages are in path
-user_site_packages = site.getusersitepackages()
-if user_site_packages not in sys.path:
-    sys.path.append(user_site_packages)
-
-from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.runnables import Runnable, RunnableLambda
 
 # Add project root to path for config imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", ".."))
 
-from config.settings import DEFAULT_LLM_MODEL
+from config.settings import DEFAULT_LLM_MODEL, EXTRACTION_MAX_CONCURRENCY, EXTRACTION_CACHE_DIR
 from config.prompts import CLAUSE_EXTRACTION_PROMPT
 
-load_dotenv()
+from .extraction_cache import ExtractionCache, prompt_version
+from .text_prep import clean_lease_text, split_lease_text
+from .llm_client import get_llm, load_env
 
 
 # Standard clause types for extraction
@@ -63,42 +58,173 @@ class ClauseExtractor:
     Produces scannable comparison data instead of full clause text.
     """
     
-    def __init__(self, model_name: str = DEFAULT_LLM_MODEL):
+    # Longer leases are extracted in overlapping windows of this many characters
+    # of cleaned text (~25K tokens each, avoids token overflow), merged afterwards
+    WINDOW_CHARS = 100000
+    WINDOW_OVERLAP_CHARS = 8000
+    
+    # Structured-output runnables per (model, API key), shared by all instances
+    _structured_llms: Dict[Tuple[str, str], Runnable] = {}
+    
+    def __init__(
+        self,
+        model_name: str = DEFAULT_LLM_MODEL,
+        concurrency: int = EXTRACTION_MAX_CONCURRENCY,
+        cache_dir: Optional[str] = EXTRACTION_CACHE_DIR,
+    ):
+        self.model_name = model_name
+        self.concurrency = concurrency
+        
+        # Opt-in disk cache keyed on model, prompt/schema version and lease text
+        self.cache = ExtractionCache(cache_dir) if cache_dir else None
+        self._prompt_version = prompt_version(CLAUSE_EXTRACTION_PROMPT, ExtractedClauses)
+        
+        load_env()
         self.api_key = os.getenv("GOOGLE_API_KEY")
         if not self.api_key:
             raise ValueError("GOOGLE_API_KEY not found in environment variables.")
         
-        # Initialize Gemini
-        self.llm = ChatGoogleGenerativeAI(
-            model=model_name,
-            temperature=0,
-            max_retries=2,
-            google_api_key=self.api_key
-        )
+        # Shared Gemini client (one connection pool per model and key)
+        self.llm = get_llm(model_name, self.api_key)
+        
+        # Constrain output to the ExtractedClauses JSON schema and validate the raw text in
+        # one pass with pydantic-core (with_structured_output would json.loads
+        # the response first, then model_validate the dict). Built once per
+        # model and key, since deriving the JSON schema walks the whole model.
+        key = (model_name, self.api_key)
+        self.structured_llm = self._structured_llms.get(key)
+        if self.structured_llm is None:
+            self.structured_llm = self._structured_llms[key] = self.llm.bind(
+                response_mime_type="application/json",
+                response_json_schema=ExtractedClauses.model_json_schema(),
+            ) | RunnableLambda(lambda message: ExtractedClauses.model_validate_json(message.text))
         
-        # Bind the schema to the model
-        self.structured_llm = self.llm.with_structured_output(ExtractedClauses)
+        # The system message never changes, so it is built once and shared
+        self.system_message = SystemMessage(content=CLAUSE_EXTRACTION_PROMPT)
+    
+    def _cache_key(self, text: str) -> Optional[str]:
+        """Cache key for a cleaned lease text (None when caching is disabled)."""
+        if self.cache is None:
+            return None
+        return ExtractionCache.key("google", self.model_name, self._prompt_version, text)
+    
+    def _cache_get(self, key: Optional[str]) -> Optional[ExtractedClauses]:
+        """Return cached clauses for key, evicting entries that no longer validate."""
+        if key is None:
+            return None
+        data = self.cache.get(key)
+        if data is None:
+            return None
+        try:
+            return ExtractedClauses.model_validate(data)
+        except ValidationError:
+            self.cache.evict(key)
+            return None
+    
+    def _cache_put(self, key: Optional[str], result: ExtractedClauses):
+        """Store extracted clauses under key (no-op when caching is disabled)."""
+        if key is not None:
+            self.cache.put(key, result.model_dump(mode="json"), self.model_name)
+    
+    def _messages(self, text: str) -> list:
+        """Build the chat messages for one lease text."""
+        return [self.system_message, HumanMessage(content=f"Lease Text:\n{text}")]
     
     def extract_clauses(self, text_content: str) -> List[dict]:
         """
         Extract clause summaries and key terms from lease text.
         
+        Text longer than WINDOW_CHARS is split into overlapping windows that
+        are extracted concurrently; clauses are merged on (clause_type,
+        article_reference), keeping the first occurrence.
+        
         Args:
             text_content: The raw text of the lease document.
             
         Returns:
             List of clause dictionaries with clause_type, summary, key_terms, article_reference.
         """
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", CLAUSE_EXTRACTION_PROMPT),
-            ("human", "Lease Text:\n{text}")
-        ])
+        return self.extract_clauses_many([text_content])[0]
+    
+    def _lookup_many(self, texts: List[str]):
+        """
+        Clean each text and look it up in the cache.
+        
+        Returns (keys, results, windows), where windows lists a
+        (document index, window text) pair for every window still to extract.
+        """
+        texts = [clean_lease_text(text) for text in texts]
+        keys = [self._cache_key(text) for text in texts]
+        results = [self._cache_get(key) for key in keys]
+        windows = [
+            (i, window)
+            for i, result in enumerate(results) if result is None
+            for window in split_lease_text(texts[i], self.WINDOW_CHARS, self.WINDOW_OVERLAP_CHARS)
+        ]
+        return keys, results, windows
+    
+    def _merge_many(self, keys, results, windows, extracted) -> List[List[dict]]:
+        """
+        Merge each document's window results and dump every document's clauses.
         
-        chain = prompt | self.structured_llm
+        A document is cached only if all of its windows succeeded.
+        """
+        merged: Dict[int, Dict[tuple, ExtractedClause]] = {}
+        failed = set()
+        for (i, _), result in zip(windows, extracted):
+            clauses = merged.setdefault(i, {})
+            if isinstance(result, Exception):
+                print(f"Error during clause extraction: {result}")
+                failed.add(i)
+                continue
+            for clause in result.clauses:
+                clauses.setdefault((clause.clause_type, clause.article_reference), clause)
         
-        try:
-            result = chain.invoke({"text": text_content[:100000]})  # Limit to avoid token overflow
-            return [clause.model_dump() for clause in result.clauses]
-        except Exception as e:
-            print(f"Error during clause extraction: {e}")
-            return []
+        for i, clauses in merged.items():
+            results[i] = ExtractedClauses(clauses=list(clauses.values()))
+            if i not in failed:
+                self._cache_put(keys[i], results[i])
+        
+        return [
+            result.model_dump()["clauses"] if result is not None else []
+            for result in results
+        ]
+    
+    async def aextract_clauses_many(self, texts: List[str]) -> List[List[dict]]:
+        """
+        Extract clause summaries from several documents concurrently.
+        
+        Cached documents are returned without a request. The windows of all
+        other documents are sent together, with at most `concurrency` requests
+        in flight. A failed window is skipped, so a document whose extraction
+        fails entirely yields an empty list.
+        
+        Args:
+            texts: Raw text of each lease document.
+            
+        Returns:
+            One list of clause dictionaries per document, in input order.
+        """
+        keys, results, windows = self._lookup_many(texts)
+        extracted = await self.structured_llm.abatch(
+            [self._messages(window) for _, window in windows],
+            config={"max_concurrency": self.concurrency},
+            return_exceptions=True,
+        )
+        return self._merge_many(keys, results, windows, extracted)
+    
+    def extract_clauses_many(self, texts: List[str]) -> List[List[dict]]:
+        """
+        Synchronous version of aextract_clauses_many().
+        
+        Runs the requests on a thread pool over the sync client rather than in
+        a throwaway event loop, which the shared client's async transport would
+        outlive.
+        """
+        keys, results, windows = self._lookup_many(texts)
+        extracted = self.structured_llm.batch(
+            [self._messages(window) for _, window in windows],
+            config={"max_concurrency": self.concurrency},
+            return_exceptions=True,
+        )
+        return self._merge_many(keys, results, windows, extracted)
@@ -0,0 +1,108 @@
+"""
+Extraction Cache Module
+
+Content-addressable disk cache for LLM extraction results.
+Re-ingesting an unchanged document returns the stored result instead of
+repeating a multi-second Gemini call.
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+import functools
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Type
+
+from pydantic import BaseModel
+
+
+@functools.lru_cache(maxsize=None)
+def prompt_version(prompt: str, schema: Type[BaseModel]) -> str:
+    """
+    Fingerprint a system prompt together with its output schema.
+
+    Part of every cache key, so editing the prompt or the model's fields
+    makes old entries unreachable without a manual version bump. Memoized,
+    as deriving the JSON schema walks the whole model.
+
+    Args:
+        prompt: The system prompt sent with each extraction.
+        schema: Pydantic model bound as structured output.
+
+    Returns:
+        Short hex digest identifying this prompt/schema pair.
+    """
+    payload = prompt + "\0" + json.dumps(schema.model_json_schema(), sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class ExtractionCache:
+    """
+    JSON-file cache of extraction results, one file per key under cache_dir.
+
+    Each file stores {"timestamp", "model", "data"} so entries can be audited.
+    Callers validate "data" on recall and evict() entries that no longer fit
+    the schema.
+    """
+
+    def __init__(self, cache_dir: str):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the cached JSON files (created if missing).
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(provider: str, model_name: str, version: str, text: str) -> str:
+        """Build the cache key for one extraction request."""
+        payload = "|".join((provider, model_name, version, text))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        """Return the JSON file holding key's entry."""
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[dict]:
+        """
+        Return the cached data for key, or None on a miss.
+
+        Unreadable files are treated as misses.
+        """
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)["data"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def put(self, key: str, data, model_name: str = ""):
+        """
+        Store JSON-serialisable data under key.
+
+        Written to a private temp file and renamed into place, so a concurrent
+        reader never sees a partial entry and concurrent writers never share
+        a temp file.
+        """
+        entry = {
+            "timestamp": datetime.now().isoformat(),
+            "model": model_name,
+            "data": data,
+        }
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=self.cache_dir, suffix=".json.tmp", delete=False
+        ) as f:
+            try:
+                json.dump(entry, f)
+            except BaseException:
+                f.close()
+                os.unlink(f.name)
+                raise
+        os.replace(f.name, self._path(key))
+
+    def evict(self, key: str):
+        """Delete the entry for key, if present."""
+        self._path(key).unlink(missing_ok=True)
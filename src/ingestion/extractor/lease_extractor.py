@@ -5,29 +5,24 @@ Extracts structured lease data from parsed documents using LLM.
 Contains the Lease Pydantic model and LeaseExtractor class.
 """
 
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 from datetime import date
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 import os
 import sys
-import site
 
-# Ensure user site-packages are in path
-user_site_packages = site.getusersitepackages()
-if user_site_packages not in sys.path:
-    sys.path.append(user_site_packages)
-
-from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.runnables import Runnable, RunnableLambda
 
 # Add project root to path for config imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", ".."))
 
-from config.settings import DEFAULT_LLM_MODEL
+from config.settings import DEFAULT_LLM_MODEL, EXTRACTION_MAX_CONCURRENCY, EXTRACTION_CACHE_DIR
 from config.prompts import LEASE_EXTRACTION_PROMPT
 
-load_dotenv()
+from .extraction_cache import ExtractionCache, prompt_version
+from .text_prep import prepare_lease_text
+from .llm_client import get_llm, load_env
 
 
 class RentStep(BaseModel):
@@ -86,13 +81,21 @@ class Lease(BaseModel):
         Calculates the weighted average annual rent PSF over the term.
         Returns 0.0 if no rent schedule is present.
         """
-        if not self.basic_rent_schedule:
+        schedule = self.basic_rent_schedule
+        if not schedule:
             return 0.0
+        
+        # A single step is its own average (the common case)
+        if len(schedule) == 1:
+            step = schedule[0]
+            if step.end_year - step.start_year + 1 <= 0:
+                return 0.0
+            return round(step.rate_psf, 2)
             
         total_value = 0.0
         total_duration = 0.0
         
-        for step in self.basic_rent_schedule:
+        for step in schedule:
             duration = step.end_year - step.start_year + 1  # Inclusive range
             
             if duration <= 0:
@@ -110,21 +113,75 @@ class Lease(BaseModel):
 class LeaseExtractor:
     """Extracts structured lease data using Gemini LLM."""
     
-    def __init__(self, model_name: str = DEFAULT_LLM_MODEL):
+    # Characters of cleaned lease text sent for extraction (enough to include the Schedules)
+    MAX_TEXT_CHARS = 150000
+    
+    # Structured-output runnables per (model, API key), shared by all instances
+    _structured_llms: Dict[Tuple[str, str], Runnable] = {}
+    
+    def __init__(
+        self,
+        model_name: str = DEFAULT_LLM_MODEL,
+        concurrency: int = EXTRACTION_MAX_CONCURRENCY,
+        cache_dir: Optional[str] = EXTRACTION_CACHE_DIR,
+    ):
+        self.model_name = model_name
+        self.concurrency = concurrency
+        
+        # Opt-in disk cache keyed on model, prompt/schema version and lease text
+        self.cache = ExtractionCache(cache_dir) if cache_dir else None
+        self._prompt_version = prompt_version(LEASE_EXTRACTION_PROMPT, Lease)
+        
+        load_env()
         self.api_key = os.getenv("GOOGLE_API_KEY")
         if not self.api_key:
             raise ValueError("GOOGLE_API_KEY not found in environment variables.")
             
-        # Initialize Gemini
-        self.llm = ChatGoogleGenerativeAI(
-            model=model_name,
-            temperature=0,
-            max_retries=2,
-            google_api_key=self.api_key
-        )
+        # Shared Gemini client (one connection pool per model and key)
+        self.llm = get_llm(model_name, self.api_key)
+        
+        # Constrain output to the Lease JSON schema and validate the raw text in
+        # one pass with pydantic-core (with_structured_output would json.loads
+        # the response first, then model_validate the dict). Built once per
+        # model and key, since deriving the JSON schema walks the whole model.
+        key = (model_name, self.api_key)
+        self.structured_llm = self._structured_llms.get(key)
+        if self.structured_llm is None:
+            self.structured_llm = self._structured_llms[key] = self.llm.bind(
+                response_mime_type="application/json",
+                response_json_schema=Lease.model_json_schema(),
+            ) | RunnableLambda(lambda message: Lease.model_validate_json(message.text))
         
-        # Bind the schema to the model
-        self.structured_llm = self.llm.with_structured_output(Lease)
+        # The system message never changes, so it is built once and shared
+        self.system_message = SystemMessage(content=LEASE_EXTRACTION_PROMPT)
+
+    def _cache_key(self, text_content: str) -> Optional[str]:
+        """Cache key for a lease text (None when caching is disabled)."""
+        if self.cache is None:
+            return None
+        return ExtractionCache.key("google", self.model_name, self._prompt_version, text_content)
+
+    def _cache_get(self, key: Optional[str]) -> Optional[Lease]:
+        """Return the cached Lease for key, evicting entries that no longer validate."""
+        if key is None:
+            return None
+        data = self.cache.get(key)
+        if data is None:
+            return None
+        try:
+            return Lease.model_validate(data)
+        except ValidationError:
+            self.cache.evict(key)
+            return None
+
+    def _cache_put(self, key: Optional[str], lease: Lease):
+        """Store an extracted Lease under key (no-op when caching is disabled)."""
+        if key is not None:
+            self.cache.put(key, lease.model_dump(mode="json"), self.model_name)
+
+    def _messages(self, text: str) -> list:
+        """Build the chat messages for one lease text."""
+        return [self.system_message, HumanMessage(content=f"Lease Text:\n{text}")]
 
     def extract(self, text_content: str) -> Lease:
         """
@@ -136,15 +193,71 @@ class LeaseExtractor:
         Returns:
             Lease object with extracted data.
         """
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", LEASE_EXTRACTION_PROMPT),
-            ("human", "Lease Text:\n{text}")
-        ])
+        text_content = prepare_lease_text(text_content, self.MAX_TEXT_CHARS)
+        key = self._cache_key(text_content)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
+        try:
+            lease = self.structured_llm.invoke(self._messages(text_content))
+        except Exception as e:
+            print(f"Error during extraction: {e}")
+            raise
+        self._cache_put(key, lease)
+        return lease
+
+    async def aextract(self, text_content: str) -> Lease:
+        """Async version of extract()."""
+        text_content = prepare_lease_text(text_content, self.MAX_TEXT_CHARS)
+        key = self._cache_key(text_content)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
+        try:
+            lease = await self.structured_llm.ainvoke(self._messages(text_content))
+        except Exception as e:
+            print(f"Error during extraction: {e}")
+            raise
+        self._cache_put(key, lease)
+        return lease
+
+    def _lookup_many(self, texts: List[str]):
+        """Prepare each text and look it up in the cache; returns (texts, keys, leases, misses)."""
+        texts = [prepare_lease_text(text, self.MAX_TEXT_CHARS) for text in texts]
+        keys = [self._cache_key(text) for text in texts]
+        leases = [self._cache_get(key) for key in keys]
+        misses = [i for i, lease in enumerate(leases) if lease is None]
+        return texts, keys, leases, misses
+
+    def iter_extract(self, texts: List[str]) -> Iterator[Tuple[int, Lease]]:
+        """
+        Extracts Lease data from several documents, yielding each as it completes.
+        
+        Lets callers persist a lease while the others are still in flight.
+        Cached leases are yielded first; the rest follow in completion order,
+        with at most `concurrency` requests in flight.
         
-        chain = prompt | self.structured_llm
+        Args:
+            texts: Raw text of each lease.
+            
+        Yields:
+            (index into texts, Lease) pairs.
+        """
+        texts, keys, leases, misses = self._lookup_many(texts)
+        for i, lease in enumerate(leases):
+            if lease is not None:
+                yield i, lease
         
         try:
-            return chain.invoke({"text": text_content})
+            for j, lease in self.structured_llm.batch_as_completed(
+                [self._messages(texts[i]) for i in misses],
+                config={"max_concurrency": self.concurrency},
+            ):
+                i = misses[j]
+                self._cache_put(keys[i], lease)
+                yield i, lease
         except Exception as e:
             print(f"Error during extraction: {e}")
-            raise e
+            raise
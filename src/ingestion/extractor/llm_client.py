@@ -0,0 +1,40 @@
+"""
+LLM Client Module
+
+Process-wide Gemini chat clients and .env loading shared by the extractors.
+"""
+
+import functools
+
+from dotenv import load_dotenv
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+
+@functools.lru_cache(maxsize=1)
+def load_env() -> bool:
+    """Load .env once, when the first extractor is built rather than at import."""
+    return load_dotenv()
+
+
+@functools.lru_cache(maxsize=8)
+def get_llm(model_name: str, api_key: str) -> ChatGoogleGenerativeAI:
+    """
+    Return the shared chat client for a model and API key.
+
+    LeaseExtractor and ClauseExtractor instances reuse it, so each new
+    extractor keeps the warm connection pool instead of building a client
+    (and opening fresh TCP/TLS sessions) per document.
+
+    Args:
+        model_name: Gemini model name.
+        api_key: Google API key.
+
+    Returns:
+        Deterministic (temperature 0) chat client with 2 retries.
+    """
+    return ChatGoogleGenerativeAI(
+        model=model_name,
+        temperature=0,
+        max_retries=2,
+        google_api_key=api_key
+    )
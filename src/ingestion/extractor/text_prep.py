@@ -0,0 +1,114 @@
+"""
+Extraction Text Preparation Module
+
+Trims parsed lease text before it is sent for LLM extraction.
+Drops the Table of Contents, repeated page footers and redundant whitespace,
+then cuts the text to a character budget (or into overlapping windows) at
+paragraph boundaries.
+"""
+
+import re
+import functools
+from typing import List
+
+from ..chunker import DocumentChunker
+
+
+# Page footers repeated on every page of the parsed lease. Unlike the chunker's
+# BOILERPLATE_PATTERNS, bare numbers are kept: in schedules they can be values.
+FOOTER_RE = re.compile(
+    r'^[^\S\n]*(?:INITIAL|Landlord[^\S\n]+Tenant|MR[^\S\n]*[–-][^\S\n]*July[^\S\n]+2020)[^\S\n]*$\n?',
+    re.MULTILINE | re.IGNORECASE
+)
+
+# Trailing whitespace on a line, and runs of spaces/tabs inside one
+TRAILING_SPACE_RE = re.compile(r'[^\S\n]+$', re.MULTILINE)
+SPACE_RUN_RE = re.compile(r'[^\S\n]{2,}')
+BLANK_LINES_RE = re.compile(r'\n{3,}')
+
+# Only cut at a paragraph break if it keeps at least this share of the budget
+MIN_CUT_RATIO = 0.9
+
+
+@functools.lru_cache(maxsize=8)
+def clean_lease_text(text: str) -> str:
+    """
+    Remove non-content noise from lease text.
+
+    Memoized on the text: ingestion runs the lease and clause extractors on
+    the same document, so the second one reuses the first one's cleaning.
+
+    Args:
+        text: Parsed lease text (markdown).
+
+    Returns:
+        Text without the Table of Contents, page footers or redundant whitespace.
+    """
+    # Table of Contents section and stray TOC entries (header + page number)
+    text = DocumentChunker.remove_toc_sections(text)
+    text = DocumentChunker.TOC_PATTERN.sub("", text)
+    text = FOOTER_RE.sub("", text)
+
+    # Whitespace only costs tokens: strip line ends, collapse runs and blank lines
+    text = TRAILING_SPACE_RE.sub("", text)
+    text = SPACE_RUN_RE.sub(" ", text)
+    return BLANK_LINES_RE.sub('\n\n', text).strip()
+
+
+def _cut_point(text: str, start: int, end: int) -> int:
+    """Last paragraph break in text[start:end], or end if none is close enough."""
+    cut = text.rfind("\n\n", start, end)
+    if cut < start + (end - start) * MIN_CUT_RATIO:
+        return end
+    return cut
+
+
+def prepare_lease_text(text: str, max_chars: int) -> str:
+    """
+    Clean lease text and truncate it to max_chars.
+
+    The cut falls on the last paragraph break before max_chars (when one is
+    close enough), so the model never sees a clause that stops mid-sentence.
+
+    Args:
+        text: Parsed lease text (markdown).
+        max_chars: Character budget for the prepared text.
+
+    Returns:
+        Cleaned text of at most max_chars characters.
+    """
+    text = clean_lease_text(text)
+    if len(text) <= max_chars:
+        return text
+    return text[:_cut_point(text, 0, max_chars)]
+
+
+def split_lease_text(text: str, window_chars: int, overlap_chars: int) -> List[str]:
+    """
+    Split cleaned lease text into overlapping windows of at most window_chars.
+
+    Windows end on paragraph breaks where possible and each one repeats the
+    last overlap_chars (from a line start) of the previous window, so a clause
+    cut at a boundary appears whole in one of them. Text that fits in one
+    window is returned as a single window.
+
+    Args:
+        text: Cleaned lease text (see clean_lease_text).
+        window_chars: Character budget per window.
+        overlap_chars: Characters shared by consecutive windows.
+
+    Returns:
+        Windows covering the whole text, in order.
+    """
+    windows = []
+    start = 0
+    while len(text) - start > window_chars:
+        end = _cut_point(text, start, start + window_chars)
+        windows.append(text[start:end].lstrip("\n"))
+        # Next window starts at the first line break inside the overlap, and
+        # always after this window's start so the loop makes progress
+        overlap_start = max(end - overlap_chars, start + 1)
+        line_start = text.find("\n", overlap_start, end)
+        start = line_start + 1 if line_start != -1 else overlap_start
+    windows.append(text[start:].lstrip("\n"))
+    return windows
@@ -17,7 +17,7 @@ import time
 import nest_asyncio
 nest_asyncio.apply()  # Allow nested event loops (needed when running in file watcher context)
 import asyncio
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from pathlib import Path
 from datetime import datetime
 from dataclasses import dataclass
@@ -188,6 +188,62 @@ class IngestionPipeline:
             "text": chunk.content[:1000],  # Pinecone metadata limit
         }
     
+    async def _chunk_and_enrich_async(
+        self,
+        full_text: str,
+        document_name: str,
+    ) -> Tuple[List[Chunk], List[EnrichedChunk]]:
+        """
+        Chunk and enrich concurrently.
+        
+        The chunker feeds a bounded queue that the enricher consumes, so LLM
+        enrichment starts on the first chunks while the rest are still being
+        produced. With use_batch_api set, the batch job needs every prompt
+        upfront, so the document is chunked first and enriched in one job.
+        
+        Args:
+            full_text: Parsed document text.
+            document_name: Original document filename for provenance.
+            
+        Returns:
+            Tuple of (chunks, enriched chunks in document order).
+        """
+        if self.enricher.use_batch_api:
+            chunks = self.chunker.chunk(full_text)
+            try:
+                enriched_chunks = [
+                    c async for c in self.enricher.enrich_chunks_stream(chunks, source_document=document_name)
+                ]
+            finally:
+                await self.enricher.aclose()
+            enriched_chunks.sort(key=lambda c: c.chunk_index)
+            return chunks, enriched_chunks
+        
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.enricher.batch_size)
+        chunks: List[Chunk] = []
+        
+        async def produce():
+            try:
+                for chunk in self.chunker.iter_chunks(full_text):
+                    chunks.append(chunk)
+                    await queue.put(chunk)
+            finally:
+                # Always release the consumer, even if chunking fails
+                await queue.put(None)
+        
+        producer = asyncio.create_task(produce())
+        try:
+            enriched_chunks = [
+                c async for c in self.enricher.enrich_from_queue(queue, source_document=document_name)
+            ]
+            await producer
+        finally:
+            # This loop ends with the document, so release the enricher's connections
+            await self.enricher.aclose()
+        
+        enriched_chunks.sort(key=lambda c: c.chunk_index)
+        return chunks, enriched_chunks
+    
     def run(
         self,
         file_path: str,
@@ -222,21 +278,28 @@ class IngestionPipeline:
             full_text = "\n\n".join(doc.text for doc in documents if hasattr(doc, 'text'))
             print(f"   Parsed {len(full_text):,} characters")
             
-            # Step 2: Chunk document
-            print("\n✂️  Step 2/6: Chunking document...")
-            chunks = self.chunker.chunk(full_text)
+            # Step 2: Chunk document (overlapped with enrichment for LLM enrichers)
+            stream_enrichment = self.config.enable_enrichment and hasattr(self.enricher, "enrich_from_queue")
+            if stream_enrichment:
+                print(f"\n✂️  Step 2/6: Chunking and enriching document (batch_size={self.config.enrichment_batch_size})...")
+                chunks, enriched_chunks = asyncio.run(self._chunk_and_enrich_async(full_text, document_name))
+            else:
+                print("\n✂️  Step 2/6: Chunking document...")
+                chunks = self.chunker.chunk(full_text)
             print(f"   Created {len(chunks)} chunks")
             
             # Step 3: Extract structured data
             print("\n🔍 Step 3/6: Extracting lease metadata...")
-            # Use more text to include Schedules (Gemini 2.5 Flash has 1M token context)
-            lease = self.extractor.extract(full_text[:150000])
+            # The extractor cleans and truncates the text itself (LeaseExtractor.MAX_TEXT_CHARS)
+            lease = self.extractor.extract(full_text)
             print(f"   Tenant: {lease.tenant_name}")
             print(f"   Landlord: {lease.landlord_name}")
             print(f"   Term: {lease.term_years} years")
             
             # Step 4: Enrich chunks (optional)
-            if self.config.enable_enrichment:
+            if stream_enrichment:
+                print(f"\n🏷️  Step 4/6: Enriched {len(enriched_chunks)} chunks during chunking")
+            elif self.config.enable_enrichment:
                 print(f"\n🏷️  Step 4/6: Enriching chunks (batch_size={self.config.enrichment_batch_size})...")
                 print(f"   ⏱️  Estimated time: {len(chunks) // self.config.enrichment_batch_size * self.config.enrichment_delay_seconds:.0f}s")
                 enriched_chunks = self.enricher.enrich_chunks(chunks, source_document=document_name)
@@ -448,7 +511,7 @@ class IngestionPipeline:
             
             # Step 2: Extract lease metadata
             print("\n🔍 Step 2/3: Extracting lease metadata...")
-            lease = self.extractor.extract(full_text[:150000])
+            lease = self.extractor.extract(full_text)
             print(f"   Tenant: {lease.tenant_name}")
             print(f"   Landlord: {lease.landlord_name}")
             
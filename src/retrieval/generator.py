@@ -29,6 +29,10 @@ from config.prompts import RAG_SYSTEM_PROMPT, RAG_HUMAN_TEMPLATE
 load_dotenv()
 
 
+# [CONFIDENCE: X%] tag the model appends to its answer
+CONFIDENCE_RE = re.compile(r'\[CONFIDENCE:\s*(\d+)%?\]', re.IGNORECASE)
+
+
 class RAGGenerator:
     """
     RAG Answer Generator for Legal Lease queries.
@@ -113,13 +117,12 @@ class RAGGenerator:
             Tuple of (cleaned_answer, confidence_percentage)
         """
         # Look for [CONFIDENCE: X%] pattern
-        pattern = r'\[CONFIDENCE:\s*(\d+)%?\]'
-        match = re.search(pattern, answer, re.IGNORECASE)
+        match = CONFIDENCE_RE.search(answer)
         
         if match:
             confidence = int(match.group(1))
             # Remove the confidence tag from the answer
-            cleaned = re.sub(pattern, '', answer, flags=re.IGNORECASE).strip()
+            cleaned = CONFIDENCE_RE.sub('', answer).strip()
             return cleaned, min(100, max(0, confidence))  # Clamp to 0-100
         
         # No confidence found - default to 75% (reasonable answer)
@@ -32,13 +32,14 @@ def re_extract_clauses():
     # Initialize extractor
     extractor = ClauseExtractor()
     
-    # Process each lease
+    # Read every lease's parsed text first, so all of them can be extracted together
+    pending = []
     for lease in leases:
         document_name = lease.get("document_name", "")
         tenant_name = lease.get("tenant_name", "Unknown")
         lease_id = lease.get("id")
         
-        print(f"Processing: {tenant_name}")
+        print(f"Reading: {tenant_name}")
         print(f"  Document: {document_name}")
         
         # Find the parsed markdown file
@@ -77,19 +78,25 @@ def re_extract_clauses():
             print(f"  ❌ Error reading file: {e}")
             continue
         
-        # Extract clauses
-        try:
-            clauses = extractor.extract_clauses(text)
-            print(f"  Extracted {len(clauses)} clauses")
-            
-            if clauses:
+        pending.append((lease_id, tenant_name, text))
+    
+    # Extract clauses for all leases concurrently (windows of every lease share
+    # one request pool; a lease whose extraction fails yields no clauses)
+    print(f"\nExtracting clauses for {len(pending)} leases...\n")
+    all_clauses = extractor.extract_clauses_many([text for _, _, text in pending])
+    
+    for (lease_id, tenant_name, _), clauses in zip(pending, all_clauses):
+        print(f"Saving: {tenant_name}")
+        print(f"  Extracted {len(clauses)} clauses")
+        
+        if clauses:
+            try:
                 num_inserted = insert_clauses(lease_id, clauses)
                 print(f"  ✅ Saved {num_inserted} clauses to database")
-            else:
-                print(f"  ⚠️ No clauses extracted")
-                
-        except Exception as e:
-            print(f"  ❌ Extraction error: {e}")
+            except Exception as e:
+                print(f"  ❌ Database error: {e}")
+        else:
+            print(f"  ⚠️ No clauses extracted")
         
         print()
     
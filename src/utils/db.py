@@ -329,6 +329,26 @@ def get_all_leases(db_path: str = DEFAULT_DB_PATH) -> list[Dict[str, Any]]:
         return [dict(row) for row in rows]
 
 
+def get_leases_summary(db_path: str = DEFAULT_DB_PATH) -> list[Dict[str, Any]]:
+    """
+    Retrieve the columns shown in the documents list view for all leases.
+    
+    Lighter than get_all_leases() for endpoints that only render a listing.
+    
+    Returns:
+        List of lease summary dictionaries.
+    """
+    with get_connection(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT id, document_name, tenant_name, trade_name, property_address,
+                   lease_start, lease_end, term_years
+            FROM leases ORDER BY tenant_name
+        """)
+        rows = cursor.fetchall()
+        return [dict(row) for row in rows]
+
+
 def _normalize_text(text: str) -> str:
     """Normalize text: apostrophes to straight quotes, remove newlines/excess spaces."""
     if not text:
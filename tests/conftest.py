@@ -0,0 +1,99 @@
+import os
+import sys
+import json
+import hashlib
+import itertools
+from types import SimpleNamespace
+
+import pytest
+from google.genai import types
+
+# Add the project root (config) and src (ingestion, generation, ...) to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (project_root, os.path.join(project_root, "src")):
+    if path not in sys.path:
+        sys.path.append(path)
+
+
+@pytest.fixture
+def make_extractor(tmp_path, monkeypatch):
+    """
+    Factory for LLM extractors with a dummy API key and a disk cache in tmp_path.
+
+    No request is sent unless a test replaces the extractor's structured_llm.
+    """
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+
+    def make(extractor_cls):
+        return extractor_cls(cache_dir=str(tmp_path))
+
+    return make
+
+
+class FakeGemini:
+    """
+    Stand-in for the async Gemini client (genai.Client(...).aio).
+
+    Serves models.generate_content, models.embed_content and batches.create,
+    recording the prompts each receives. respond(prompt) builds the response
+    text; by default every chunk gets a distinct JSON enrichment (an array for
+    grouped prompts). Embeddings are derived from the text, so equal texts
+    embed identically.
+    """
+
+    def __init__(self):
+        self.models = self.batches = self
+        self.calls = []
+        self.embed_calls = []
+        self.batch_calls = []
+        self.respond = self.enrichment_json
+        self.answers = itertools.count()
+
+    def enrichment_json(self, prompt):
+        items = [
+            {
+                "contextual_summary": f"This clause is answer {next(self.answers)}",
+                "semantic_tags": ["lease_terms"],
+                "key_entities": [],
+                "clause_type": "other",
+            }
+            for _ in range(max(prompt.count("[CHUNK "), 1))
+        ]
+        return json.dumps(items if "[CHUNK " in prompt else items[0])
+
+    async def generate_content(self, model, contents, config=None):
+        self.calls.append(contents)
+        return SimpleNamespace(text=self.respond(contents))
+
+    async def embed_content(self, model, contents):
+        self.embed_calls.append(contents)
+        digest = hashlib.sha256(contents.encode("utf-8")).digest()
+        return SimpleNamespace(embeddings=[SimpleNamespace(values=[b - 128 for b in digest[:8]])])
+
+    async def create(self, model, src, config=None):
+        self.batch_calls.append([request.contents for request in src])
+        responses = [
+            SimpleNamespace(response=SimpleNamespace(text=self.respond(request.contents)), error=None)
+            for request in src
+        ]
+        return SimpleNamespace(
+            name="batches/test",
+            state=types.JobState.JOB_STATE_SUCCEEDED,
+            dest=SimpleNamespace(inlined_responses=responses),
+            error=None,
+        )
+
+
+@pytest.fixture
+def fake_gemini(monkeypatch):
+    """
+    Route every ChunkEnricher's async Gemini calls to one FakeGemini.
+
+    Sets a dummy API key so enrichers construct without network access.
+    """
+    from ingestion.enricher import ChunkEnricher
+
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    fake = FakeGemini()
+    monkeypatch.setattr(ChunkEnricher, "aio", property(lambda self: fake))
+    return fake
@@ -0,0 +1,53 @@
+import random
+import time
+
+from config.settings import ORPHAN_CHUNK_MIN_TOKENS
+from ingestion.chunker import DocumentChunker
+
+
+def make_document(rng: random.Random) -> str:
+    """Markdown lease with many header-only and one-line (orphan) sections."""
+    blocks = []
+    for i in range(rng.randint(1, 40)):
+        header = rng.choice(["#", "##"])
+        blocks.append(f"{header} {i}.01 Section {i}")
+        for _ in range(rng.choice([0, 0, 1, 1, 3, 20])):
+            blocks.append(" ".join(rng.choice(["Tenant", "shall", "pay", "Rent", "monthly."])
+                                   for _ in range(rng.randint(1, 30))))
+    return "\n\n".join(blocks)
+
+
+def test_only_last_chunk_may_be_below_orphan_threshold():
+    chunker = DocumentChunker()
+    rng = random.Random(0)
+    for _ in range(300):
+        chunks = chunker.chunk(make_document(rng))
+        assert all(c.token_count >= ORPHAN_CHUNK_MIN_TOKENS for c in chunks[:-1])
+
+
+def test_orphan_headers_fold_into_next_chunk():
+    text = "# ARTICLE 3 RENT\n\n## 3.01 Basic Rent\n\n" + "The Tenant shall pay Basic Rent monthly. " * 10
+    chunks = DocumentChunker().chunk(text)
+
+    assert len(chunks) == 1
+    assert chunks[0].content.startswith("# ARTICLE 3 RENT")
+    assert chunks[0].metadata == {"article": "ARTICLE 3 RENT", "section": "3.01 Basic Rent"}
+
+
+def test_toc_section_removed_up_to_first_article():
+    text = (
+        "Preamble\n# TABLE OF CONTENTS\n# 1.01 Definitions\n3\n"
+        "\n# ARTICLE 1 INTERPRETATION\n1.01 Definitions mean things."
+    )
+    assert DocumentChunker.remove_toc_sections(text) == (
+        "Preamble\n\n# ARTICLE 1 INTERPRETATION\n1.01 Definitions mean things."
+    )
+
+
+def test_toc_headings_without_end_marker_clean_in_linear_time():
+    # Each unterminated heading made the lazy section regex rescan to the end
+    text = "# TABLE OF CONTENTS\nLandlord Tenant\n" * 15000
+    start = time.perf_counter()
+    assert DocumentChunker.remove_toc_sections(text) == text
+    DocumentChunker()._clean_text(text)
+    assert time.perf_counter() - start < 5
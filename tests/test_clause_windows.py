@@ -0,0 +1,103 @@
+from ingestion.extractor import ClauseExtractor, ExtractedClause, ExtractedClauses
+from ingestion.extractor.text_prep import split_lease_text
+
+
+def make_lease_text(paragraphs: int = 200) -> str:
+    """Lease-like text: numbered paragraphs of a few lines each."""
+    return "\n\n".join(
+        f"# {i}.01 Section {i}\nThe Tenant shall pay {i} dollars.\nLine two of section {i}."
+        for i in range(paragraphs)
+    )
+
+
+def assert_covers(text: str, windows, window_chars: int):
+    """Every window fits the budget, and together they cover text with no gap."""
+    covered = 0
+    for window in windows:
+        assert 0 < len(window) <= window_chars
+        pos = text.find(window, max(covered - window_chars, 0))
+        assert pos != -1
+        # Only the line breaks stripped from a window's start may be skipped
+        assert text[covered:pos].strip("\n") == ""
+        covered = max(covered, pos + len(window))
+    assert text[covered:].strip() == ""
+
+
+def test_short_text_is_one_window():
+    assert split_lease_text("short lease", 100, 10) == ["short lease"]
+
+
+def test_window_bounds_and_overlap():
+    text = make_lease_text()
+    windows = split_lease_text(text, 1000, 200)
+
+    assert len(windows) > 1
+    assert_covers(text, windows, 1000)
+    for previous, window in zip(windows, windows[1:]):
+        # Each window starts on a line that the previous one ended with
+        first_line = window.split("\n", 1)[0]
+        assert first_line in previous[-200:]
+
+
+def test_terminates_when_overlap_close_to_window():
+    text = make_lease_text(50)
+    for overlap in (890, 899, 900, 950):
+        windows = split_lease_text(text, 900, overlap)
+        assert_covers(text, windows, 900)
+
+    # No line breaks at all, so the overlap falls back to a plain offset
+    text = " ".join(str(i) for i in range(300))
+    assert_covers(text, split_lease_text(text, 90, 89), 90)
+
+
+def clause(clause_type, article, summary):
+    return ExtractedClause(
+        clause_type=clause_type,
+        article_reference=article,
+        summary=summary,
+        key_terms="",
+    )
+
+
+def test_merge_keeps_first_occurrence(make_extractor):
+    extractor = make_extractor(ClauseExtractor)
+    keys = [extractor._cache_key("lease")]
+    windows = [(0, "window 1"), (0, "window 2")]
+    extracted = [
+        ExtractedClauses(clauses=[
+            clause("rent_payment", "Article 3", "first"),
+            clause("insurance", "Article 9", "insurance"),
+        ]),
+        ExtractedClauses(clauses=[
+            clause("rent_payment", "Article 3", "repeated in overlap"),
+            clause("rent_payment", "Article 4", "other article"),
+        ]),
+    ]
+
+    [clauses] = extractor._merge_many(keys, [None], windows, extracted)
+
+    assert [(c["clause_type"], c["article_reference"], c["summary"]) for c in clauses] == [
+        ("rent_payment", "Article 3", "first"),
+        ("insurance", "Article 9", "insurance"),
+        ("rent_payment", "Article 4", "other article"),
+    ]
+    assert extractor._cache_get(keys[0]) is not None
+
+
+def test_failed_window_is_not_cached(make_extractor):
+    extractor = make_extractor(ClauseExtractor)
+    keys = [extractor._cache_key("lease 1"), extractor._cache_key("lease 2")]
+    windows = [(0, "window 1"), (0, "window 2"), (1, "window 1")]
+    extracted = [
+        ExtractedClauses(clauses=[clause("insurance", "Article 9", "kept")]),
+        RuntimeError("window failed"),
+        ExtractedClauses(clauses=[clause("termination", "Article 20", "ok")]),
+    ]
+
+    clauses = extractor._merge_many(keys, [None, None], windows, extracted)
+
+    # The partial result is still returned, but only the complete one is cached
+    assert [c["summary"] for c in clauses[0]] == ["kept"]
+    assert [c["summary"] for c in clauses[1]] == ["ok"]
+    assert extractor._cache_get(keys[0]) is None
+    assert extractor._cache_get(keys[1]) is not None
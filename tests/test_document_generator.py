@@ -0,0 +1,94 @@
+from pathlib import Path
+
+from docx import Document
+
+from generation.document_generator import (
+    DocumentGenerator,
+    LeaseGenerationInput,
+    RentRow,
+    parse_date,
+)
+
+
+def make_template(path: Path) -> Path:
+    """Small lease template exercising split runs, repeats, headers and tables."""
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = "Lease with {{ tenant_name }}"
+
+    # Tag split across three runs, with formatting on the middle run
+    p = doc.add_paragraph("Tenant: ")
+    p.add_run("{{ ten")
+    p.add_run("ant_na").bold = True
+    p.add_run("me }} (the Tenant)")
+
+    doc.add_paragraph("{{ trade_name }} and {{ trade_name }} again, dated the {{ lease_day_ordinal }}")
+    doc.add_paragraph("Left alone: {{ unknown_tag }} and {{ deposit_amount }}")
+
+    table = doc.add_table(rows=1, cols=1)
+    table.rows[0].cells[0].text = "Premises: {{ premises_unit }}"
+
+    rent = doc.add_table(rows=2, cols=4)
+    for cell, header in zip(rent.rows[0].cells, ("Lease Year", "Per Square Foot", "Per Annum", "Per Month")):
+        cell.text = header
+    rent.rows[1].cells[0].text = "{{ tenant_name }}"
+
+    doc.save(str(path))
+    return path
+
+
+def make_input() -> LeaseGenerationInput:
+    return LeaseGenerationInput(
+        tenant_name="ACME Corporation Ltd.",
+        trade_name="ACME",
+        premises_unit="Unit #200",
+        lease_date="January 15, 2026",
+        rent_schedule=[
+            RentRow(1, 2, 30.0, 75000.0, 6250.0),
+            RentRow(3, 3, 32.5, 81250.0, 6770.83),
+            RentRow(4, 5, 35.0, 87500.0, 7291.67),
+        ],
+    )
+
+
+def generate(tmp_path) -> Document:
+    generator = DocumentGenerator(make_template(tmp_path / "template.docx"))
+    return Document(str(generator.generate(make_input(), tmp_path / "out" / "lease.docx")))
+
+
+def test_split_run_and_repeated_tags(tmp_path):
+    doc = generate(tmp_path)
+    texts = [p.text for p in doc.paragraphs]
+
+    assert texts[0] == "Tenant: ACME Corporation Ltd. (the Tenant)"
+    assert texts[1] == "ACME and ACME again, dated the 15th"
+    # Unknown tags and tags without a value are left in place
+    assert texts[2] == "Left alone: {{ unknown_tag }} and {{ deposit_amount }}"
+
+    # Run formatting survives: the value sits in the first run of the tag
+    runs = doc.paragraphs[0].runs
+    assert runs[1].text == "ACME Corporation Ltd." and not runs[1].bold
+    assert [r.text for r in runs[2:]] == ["", " (the Tenant)"]
+
+
+def test_headers_and_tables_are_filled(tmp_path):
+    doc = generate(tmp_path)
+
+    assert doc.sections[0].header.paragraphs[0].text == "Lease with ACME Corporation Ltd."
+    assert doc.tables[0].rows[0].cells[0].text == "Premises: Unit #200"
+
+
+def test_rent_schedule_rows_are_populated(tmp_path):
+    rent = generate(tmp_path).tables[1]
+
+    assert [[cell.text for cell in row.cells] for row in rent.rows] == [
+        ["Lease Year", "Per Square Foot", "Per Annum", "Per Month"],
+        ["1-2", "$30.00", "$75,000.00", "$6,250.00"],
+        ["3", "$32.50", "$81,250.00", "$6,770.83"],
+        ["4-5", "$35.00", "$87,500.00", "$7,291.67"],
+    ]
+
+
+def test_parse_date():
+    parts = parse_date("March 3, 2021")
+    assert (parts.day_ordinal, parts.month, parts.month_num, parts.year_short) == ("3rd", "March", "03", "21")
+    assert parse_date("not a date") == parse_date("")
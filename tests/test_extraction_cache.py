@@ -0,0 +1,60 @@
+from ingestion.extractor import ExtractionCache, LeaseExtractor
+
+
+LEASE_DATA = {
+    "tenant_name": "Tenant Co.",
+    "landlord_name": "Landlord Inc.",
+    "premises_description": "Unit 101",
+    "rentable_area_sqft": 1200.0,
+    "term_years": 10.0,
+}
+
+
+def test_put_get_round_trip(tmp_path):
+    cache = ExtractionCache(str(tmp_path))
+    key = ExtractionCache.key("google", "model", "v1", "lease text")
+
+    assert cache.get(key) is None
+    cache.put(key, {"tenant_name": "Tenant Co."}, "model")
+    assert cache.get(key) == {"tenant_name": "Tenant Co."}
+
+    # Only the entry itself is left behind, no temp files
+    assert [p.name for p in tmp_path.iterdir()] == [f"{key}.json"]
+
+
+def test_key_depends_on_every_part():
+    base = ExtractionCache.key("google", "model", "v1", "text")
+    assert base != ExtractionCache.key("google", "other", "v1", "text")
+    assert base != ExtractionCache.key("google", "model", "v2", "text")
+    assert base != ExtractionCache.key("google", "model", "v1", "text 2")
+
+
+def test_corrupt_file_is_a_miss(tmp_path):
+    cache = ExtractionCache(str(tmp_path))
+    (tmp_path / "truncated.json").write_text('{"data": {"tenant', encoding="utf-8")
+    (tmp_path / "no_data.json").write_text('{"model": "m"}', encoding="utf-8")
+
+    assert cache.get("truncated") is None
+    assert cache.get("no_data") is None
+
+
+def test_evict(tmp_path):
+    cache = ExtractionCache(str(tmp_path))
+    cache.put("key", {"a": 1})
+    cache.evict("key")
+    cache.evict("key")  # Missing entries are ignored
+    assert cache.get("key") is None
+
+
+def test_invalid_entry_is_evicted(tmp_path, make_extractor):
+    extractor = make_extractor(LeaseExtractor)
+    key = extractor._cache_key("lease text")
+
+    # Valid JSON that no longer fits the Lease schema
+    extractor.cache.put(key, {"tenant_name": "Tenant Co."})
+    assert extractor._cache_get(key) is None
+    assert not (tmp_path / f"{key}.json").exists()
+
+    extractor.cache.put(key, LEASE_DATA)
+    lease = extractor._cache_get(key)
+    assert lease is not None and lease.tenant_name == "Tenant Co."
@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+
+import pytest
+
+from ingestion.chunker import DocumentChunker
+from ingestion.enricher import ChunkEnricher
+from ingestion.extractor import Lease
+
+ingest_pipeline = pytest.importorskip("ingestion.ingest_pipeline")
+
+
+RENT = (
+    "# ARTICLE 1 RENT\nThe Tenant shall pay Base Rent of $5,000 per month on the first day "
+    "of each month, without deduction or set-off."
+)
+LEASE_TEXT = "\n\n".join([
+    RENT,
+    "# ARTICLE 2 NOTICES\nAll notices shall be in writing and delivered to the addresses set "
+    "out in the Basic Lease Information.",
+    RENT,  # Same article and text, so the same prompt
+    "# ARTICLE 3 INSURANCE\nThe Tenant shall maintain commercial general liability insurance "
+    "of not less than $2,000,000 per occurrence.",
+])
+
+LEASE = Lease(
+    tenant_name="Tenant Co.",
+    landlord_name="Landlord Inc.",
+    premises_description="Unit 101",
+    rentable_area_sqft=1200.0,
+    term_years=10.0,
+)
+
+
+def make_pipeline(enricher, monkeypatch):
+    """IngestionPipeline over the real chunker and enricher, with the services faked."""
+    monkeypatch.setattr(ingest_pipeline, "insert_lease", lambda lease, name: 1)
+    monkeypatch.setattr(ingest_pipeline, "ClauseExtractor", lambda: SimpleNamespace(extract_clauses=lambda text: []))
+
+    pipeline = ingest_pipeline.IngestionPipeline.__new__(ingest_pipeline.IngestionPipeline)
+    pipeline.config = ingest_pipeline.PipelineConfig(embedding_delay_seconds=0)
+    pipeline.parser = SimpleNamespace(parse_file=lambda path, out: [SimpleNamespace(text=LEASE_TEXT)])
+    pipeline.chunker = DocumentChunker()
+    pipeline.enricher = enricher
+    pipeline.extractor = SimpleNamespace(extract=lambda text: LEASE)
+    pipeline.embeddings = SimpleNamespace(embed_documents=lambda texts: [[0.1, 0.2] for _ in texts])
+    pipeline.upserted = []
+    pipeline.index = SimpleNamespace(upsert=lambda vectors, namespace: pipeline.upserted.extend(vectors))
+    return pipeline
+
+
+@pytest.mark.parametrize("use_batch_api", [False, True])
+def test_run_enriches_each_distinct_prompt_once(use_batch_api, fake_gemini, monkeypatch, tmp_path):
+    enricher = ChunkEnricher(cache_path=None, use_batch_api=use_batch_api, chunks_per_request=1)
+    pipeline = make_pipeline(enricher, monkeypatch)
+
+    result = pipeline.run("lease.docx", str(tmp_path / "lease.md"))
+
+    assert result.success, result.error_message
+    assert result.vectors_uploaded == 4
+
+    # The repeated rent article is sent once, through the requested API
+    if use_batch_api:
+        assert fake_gemini.calls == []
+        [prompts] = fake_gemini.batch_calls
+    else:
+        assert fake_gemini.batch_calls == []
+        prompts = fake_gemini.calls
+    assert len(prompts) == 3
+
+    metadata = [v["metadata"] for v in pipeline.upserted]
+    assert [m["chunk_index"] for m in metadata] == [0, 1, 2, 3]
+    assert metadata[2]["contextual_summary"] == metadata[0]["contextual_summary"]
+    assert len({m["contextual_summary"] for m in metadata}) == 3
+    assert all(m["contextual_summary"].startswith("This clause") for m in metadata)
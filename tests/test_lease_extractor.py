@@ -0,0 +1,54 @@
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from ingestion.extractor import Lease, LeaseExtractor
+
+
+def make_lease(tenant_name: str) -> Lease:
+    return Lease(
+        tenant_name=tenant_name,
+        landlord_name="Landlord Inc.",
+        premises_description="Unit 101",
+        rentable_area_sqft=1200.0,
+        term_years=10.0,
+    )
+
+
+def fake_llm(calls: list) -> RunnableLambda:
+    """Structured-output stand-in: the tenant is the last word of the lease text."""
+    def invoke(messages) -> Lease:
+        text = messages[-1].content
+        calls.append(text)
+        return make_lease(text.split()[-1])
+    return RunnableLambda(invoke)
+
+
+def test_iter_extract_yields_cached_first_then_extracts_the_rest(make_extractor):
+    extractor = make_extractor(LeaseExtractor)
+    calls = []
+    extractor.structured_llm = fake_llm(calls)
+    texts = ["Lease for Alpha", "Lease for Beta", "Lease for Gamma"]
+
+    # Pre-cache the second lease under its prepared-text key
+    extractor._cache_put(extractor._cache_key(texts[1]), make_lease("Cached"))
+
+    results = list(extractor.iter_extract(texts))
+
+    assert results[0] == (1, make_lease("Cached"))
+    assert sorted((i, lease.tenant_name) for i, lease in results[1:]) == [(0, "Alpha"), (2, "Gamma")]
+    assert len(calls) == 2
+
+    # Fresh extractions were cached, so a second run sends no request
+    assert sorted(i for i, _ in extractor.iter_extract(texts)) == [0, 1, 2]
+    assert len(calls) == 2
+
+
+def test_iter_extract_propagates_errors(make_extractor):
+    extractor = make_extractor(LeaseExtractor)
+
+    def fail(messages):
+        raise RuntimeError("quota exceeded")
+
+    extractor.structured_llm = RunnableLambda(fail)
+    with pytest.raises(RuntimeError, match="quota"):
+        list(extractor.iter_extract(["Lease for Alpha"]))